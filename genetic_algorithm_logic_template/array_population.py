@@ -0,0 +1,228 @@
+"""
+Module contains population for genetic algorithm stored as one contiguous NumPy matrix.
+
+Every row of the matrix is one chromosome and every column is one parameter from the configuration dictionary
+(the same configuration as in population module). Selection, crossover and mutation work on the whole matrix,
+so the next generation is created with a few array operations instead of one Python call per child.
+Explanation:
+    Crossover methods:
+        uniform - every gene is taken from one of the parents with equal probability.
+        one_point - genes after one random cut point are swapped between parents.
+        two_point - genes between two random cut points are swapped between parents.
+    Mutation - gene is moved by random number of steps from range [-mutation, mutation] and kept inside the
+               range of the parameter.
+
+Example:
+    Array population may be created from the configuration dictionary
+    >>>from gom.genetic_logic import array_population
+    >>>configuration_dictionary = {'param1': [10, 90, 5, 4], 'param2': [10, 80, 10, 2]}
+    >>>initial_population = array_population.ArrayPopulation.from_configuration(configuration_dictionary, size=1000)
+    >>># Population can be returned from generate_initial_population of GeneticFunctionsInterface implementation.
+
+"""
+import time
+
+import numpy
+
+from gom.genetic_logic import population as population_module
+
+CROSSOVER_METHODS = ('uniform', 'one_point', 'two_point')
+
+
+class ArrayPopulation(object):
+    """Population of chromosomes stored as 2-D NumPy matrix with vectorized genetic operators."""
+
+    def __init__(self, genes: numpy.ndarray, lower: numpy.ndarray, step: numpy.ndarray, counts: numpy.ndarray,
+                 mutation: numpy.ndarray, crossover_method: str = 'uniform', tournament_size: int = 2,
+                 rng: numpy.random.Generator = None):
+        """
+        Construct object of ArrayPopulation.
+
+        :param genes: 2-D matrix with one chromosome per row.
+        :param lower: bottom of range for each parameter.
+        :param step: step for each parameter.
+        :param counts: number of possible values for each parameter.
+        :param mutation: maximal number of steps gene is moved by mutation for each parameter.
+        :param crossover_method: one of CROSSOVER_METHODS.
+        :param tournament_size: number of chromosomes competing for being a parent.
+        :param rng: NumPy random generator (default: new generator).
+
+        :raise ValueError: Raise exception if crossover method is unknown.
+
+        :return ArrayPopulation: instance of class ArrayPopulation.
+        """
+        if crossover_method not in CROSSOVER_METHODS:
+            raise ValueError(f'Unknown crossover method "{crossover_method}". Use one of {CROSSOVER_METHODS}.')
+        self.genes = numpy.ascontiguousarray(genes)
+        self.lower = lower
+        self.step = step
+        self.counts = counts
+        self.mutation = mutation
+        self.crossover_method = crossover_method
+        self.tournament_size = tournament_size
+        self.rng = rng if rng is not None else numpy.random.default_rng()
+
+    @classmethod
+    def from_configuration(cls, configuration: dict, size: int, crossover_method: str = 'uniform',
+                           tournament_size: int = 2, seed: int = None) -> 'ArrayPopulation':
+        """
+        Create population of random chromosomes based on the configuration dictionary.
+
+        :param configuration: Dictionary with configuration consist with the name of the parameter as a key and
+                    list of bottom for range, top for range, step and mutation as value.
+        :param size: number of chromosomes in population.
+        :param crossover_method: one of CROSSOVER_METHODS.
+        :param tournament_size: number of chromosomes competing for being a parent.
+        :param seed: seed for NumPy random generator.
+
+        :return ArrayPopulation: population with random chromosomes.
+        """
+        population_module.validate_configuration_dictionary(configuration)
+        parameters = numpy.array(list(configuration.values()), dtype=numpy.int64).reshape(-1, 4)
+        lower, upper, step, mutation = parameters.T
+        counts = numpy.array([len(range(*parameter[:3])) for parameter in parameters], dtype=numpy.int64)
+        rng = numpy.random.default_rng(seed)
+
+        indices = rng.integers(0, counts, size=(size, len(counts)))
+        return cls(
+            genes=lower + indices * step,
+            lower=lower,
+            step=step,
+            counts=counts,
+            mutation=mutation,
+            crossover_method=crossover_method,
+            tournament_size=tournament_size,
+            rng=rng
+        )
+
+    def like(self, genes: numpy.ndarray) -> 'ArrayPopulation':
+        """
+        Create population with passed genes sharing configuration and random generator with this one.
+
+        :param genes: 2-D matrix with one chromosome per row.
+
+        :return ArrayPopulation: new population.
+        """
+        return type(self)(
+            genes=genes,
+            lower=self.lower,
+            step=self.step,
+            counts=self.counts,
+            mutation=self.mutation,
+            crossover_method=self.crossover_method,
+            tournament_size=self.tournament_size,
+            rng=self.rng
+        )
+
+    def __len__(self) -> int:
+        return len(self.genes)
+
+    def __getitem__(self, index):
+        """
+        Get chromosome (or list of chromosomes for slice) as tuple, the same as in population module.
+        """
+        if isinstance(index, slice):
+            return [tuple(row) for row in self.genes[index].tolist()]
+        return tuple(self.genes[index].tolist())
+
+    def __iter__(self):
+        return (tuple(row) for row in self.genes.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        return self.genes if dtype is None else self.genes.astype(dtype)
+
+    def to_list(self) -> list:
+        """
+        Convert population to list of tuples.
+
+        :return list: chromosomes as tuples.
+        """
+        return list(self)
+
+    def select_parents(self, fitness_values: numpy.ndarray, number_of_pairs: int) -> (numpy.ndarray, numpy.ndarray):
+        """
+        Choose parents with tournament selection (higher fitness value wins).
+
+        :param fitness_values: 1-D array of fitness values in the same order as rows.
+        :param number_of_pairs: number of pairs of parents to choose.
+
+        :return numpy.ndarray, numpy.ndarray: genes of first and second parent for each pair.
+        """
+        fitness_values = numpy.asarray(fitness_values)
+        candidates = self.rng.integers(0, len(self.genes), size=(2 * number_of_pairs, self.tournament_size))
+        winners = candidates[numpy.arange(len(candidates)), numpy.argmax(fitness_values[candidates], axis=1)]
+        return self.genes[winners[:number_of_pairs]], self.genes[winners[number_of_pairs:]]
+
+    def crossover(self, parents_a: numpy.ndarray, parents_b: numpy.ndarray, probability: float) -> numpy.ndarray:
+        """
+        Breed two children from each pair of parents.
+
+        Pairs which are not crossed pass their parents unchanged.
+
+        :param parents_a: genes of first parent for each pair.
+        :param parents_b: genes of second parent for each pair.
+        :param probability: probability of crossover for each pair.
+
+        :return numpy.ndarray: genes of children, two rows per pair.
+        """
+        number_of_pairs, number_of_genes = parents_a.shape
+        columns = numpy.arange(number_of_genes)
+
+        if self.crossover_method == 'uniform':
+            mask = self.rng.random((number_of_pairs, number_of_genes)) < 0.5
+        elif self.crossover_method == 'one_point':
+            cuts = self.rng.integers(1, max(number_of_genes, 2), size=(number_of_pairs, 1))
+            mask = columns >= cuts
+        else:
+            cuts = numpy.sort(self.rng.integers(0, number_of_genes + 1, size=(number_of_pairs, 2)), axis=1)
+            mask = (columns >= cuts[:, :1]) & (columns < cuts[:, 1:])
+        mask &= (self.rng.random(number_of_pairs) < probability)[:, None]
+
+        children = numpy.empty((2 * number_of_pairs, number_of_genes), dtype=self.genes.dtype)
+        children[0::2] = numpy.where(mask, parents_b, parents_a)
+        children[1::2] = numpy.where(mask, parents_a, parents_b)
+        return children
+
+    def mutate(self, genes: numpy.ndarray, probability: float) -> numpy.ndarray:
+        """
+        Mutate chromosomes in place. Each chromosome is mutated with passed probability.
+
+        :param genes: 2-D matrix with one chromosome per row.
+        :param probability: probability of mutation for each chromosome.
+
+        :return numpy.ndarray: mutated genes.
+        """
+        mutated_rows = numpy.flatnonzero(self.rng.random(len(genes)) < probability)
+        if len(mutated_rows) == 0:
+            return genes
+
+        indices = (genes[mutated_rows] - self.lower) // self.step
+        shifts = self.rng.integers(-self.mutation, self.mutation + 1, size=indices.shape)
+        indices = numpy.clip(indices + shifts, 0, self.counts - 1)
+        genes[mutated_rows] = self.lower + indices * self.step
+        return genes
+
+    def next_generation(self, fitness_values: numpy.ndarray, probability_crossover: float,
+                        probability_mutation: float, phase_times: dict = None) -> 'ArrayPopulation':
+        """
+        Create next generation of the same size with selection, crossover and mutation.
+
+        :param fitness_values: 1-D array of fitness values in the same order as rows.
+        :param probability_crossover: probability of crossover for each pair of parents.
+        :param probability_mutation: probability of mutation for each child.
+        :param phase_times: dict filled with seconds spent in 'selection', 'crossover' and 'mutation' (optional).
+
+        :return ArrayPopulation: new population.
+        """
+        size = len(self.genes)
+        phase_start = time.perf_counter()
+        parents_a, parents_b = self.select_parents(fitness_values, (size + 1) // 2)
+        selection_end = time.perf_counter()
+        children = self.crossover(parents_a, parents_b, probability_crossover)
+        crossover_end = time.perf_counter()
+        children = self.mutate(children, probability_mutation)
+        if phase_times is not None:
+            phase_times['selection'] = selection_end - phase_start
+            phase_times['crossover'] = crossover_end - selection_end
+            phase_times['mutation'] = time.perf_counter() - crossover_end
+        return self.like(children[:size])
@@ -0,0 +1,182 @@
+"""
+Benchmark of genetic algorithm throughput for reference problems, population sizes and evaluation backends.
+
+For every combination of problem, population size, backend and number of workers genetic algorithm runs fixed
+number of generations. Result contains generations per second, evaluations per second and peak memory traced
+by tracemalloc (tracing slows run down the same way for every version, so results stay comparable).
+Results are stored as JSON. When previous results are passed, every case slower than allowed tolerance is reported
+as regression and script exits with code 1.
+
+Without arguments script runs quick smoke sweep (CPU bound problems, populations up to 10000),
+larger populations and I/O bound sleep problem have to be requested explicitly.
+
+Example:
+    Run from the folder containing gom package:
+    >>>python -m gom.genetic_logic.benchmark --problems onemax rastrigin_vectorized sleep \
+    >>>    --sizes 100 1000 10000 100000 --backends serial thread process --workers 2 4 8 --output results.json
+    >>>python -m gom.genetic_logic.benchmark --output new.json --compare results.json --tolerance 0.1
+
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy
+from loguru import logger
+
+from gom.genetic_logic import benchmark_problems
+from gom.genetic_logic import evaluators
+from gom.genetic_logic import genetic_algorithm
+
+BACKENDS = {
+    'serial': lambda workers: evaluators.SerialEvaluator(),
+    'thread': lambda workers: evaluators.ThreadPoolEvaluator(number_of_workers=workers),
+    'process': lambda workers: evaluators.ProcessPoolEvaluator(number_of_workers=workers),
+    'asyncio': lambda workers: evaluators.AsyncioEvaluator(max_concurrency=workers),
+}
+
+
+def run_case(problem: str, population_size: int, backend: str, workers: int, generations: int,
+             number_of_genes: int) -> dict:
+    """
+    Run genetic algorithm for one benchmark case.
+
+    :param problem: name of problem from benchmark_problems.PROBLEMS.
+    :param population_size: number of chromosomes in population.
+    :param backend: name of backend from BACKENDS.
+    :param workers: number of workers of backend.
+    :param generations: number of generations.
+    :param number_of_genes: number of genes in chromosome.
+
+    :return dict: description and results of the case.
+    """
+    genetics = benchmark_problems.PROBLEMS[problem](population_size, number_of_genes, generations)
+    algorithm = genetic_algorithm.GeneticAlgorithm(genetics, evaluator=BACKENDS[backend](workers))
+
+    tracemalloc.start()
+    run_start = time.perf_counter()
+    algorithm.run()
+    run_time = time.perf_counter() - run_start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'problem': problem,
+        'population_size': population_size,
+        'backend': backend,
+        'workers': workers,
+        'generations': algorithm.generation,
+        'evaluations': algorithm.evaluations,
+        'run_time': run_time,
+        'generations_per_second': algorithm.generation / run_time,
+        'evaluations_per_second': algorithm.evaluations / run_time,
+        'peak_memory_mb': peak_memory / 2 ** 20,
+        'best_fitness': float(algorithm.best_solution[0]),
+    }
+
+
+def run_benchmark(problems: list, sizes: list, backends: list, workers: list, generations: int,
+                  number_of_genes: int) -> list:
+    """
+    Run all combinations of benchmark cases. Serial backend runs only with one worker.
+
+    :param problems: names of problems from benchmark_problems.PROBLEMS.
+    :param sizes: population sizes.
+    :param backends: names of backends from BACKENDS.
+    :param workers: numbers of workers of pool backends.
+    :param generations: number of generations of every case.
+    :param number_of_genes: number of genes in chromosome.
+
+    :return list: results of all cases.
+    """
+    results = []
+    for problem in problems:
+        for population_size in sizes:
+            for backend in backends:
+                for number_of_workers in ([1] if backend == 'serial' else workers):
+                    result = run_case(problem, population_size, backend, number_of_workers, generations,
+                                      number_of_genes)
+                    print(f"{problem:<22} size={population_size:<7} {backend:<8} workers={number_of_workers:<3} "
+                          f"{result['generations_per_second']:10.2f} gen/s "
+                          f"{result['evaluations_per_second']:12.0f} eval/s "
+                          f"{result['peak_memory_mb']:8.1f} MB")
+                    results.append(result)
+    return results
+
+
+def find_regressions(results: list, baseline: list, tolerance: float) -> list:
+    """
+    Find cases with evaluations per second lower than in baseline by more than tolerance.
+
+    :param results: results of current run.
+    :param baseline: results of previous run.
+    :param tolerance: allowed relative slowdown (0.1 means 10%).
+
+    :return list: (case, baseline evaluations per second, current evaluations per second) of slower cases.
+    """
+    def case(result):
+        return result['problem'], result['population_size'], result['backend'], result['workers']
+
+    baseline_by_case = {case(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline_by_case.get(case(result))
+        if previous and result['evaluations_per_second'] < previous['evaluations_per_second'] * (1 - tolerance):
+            regressions.append((case(result), previous['evaluations_per_second'], result['evaluations_per_second']))
+    return regressions
+
+
+def get_input_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--problems', nargs='+', default=['onemax', 'rastrigin_vectorized'],
+                        choices=sorted(benchmark_problems.PROBLEMS), help='Reference problems to run.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000, 10000],
+                        help='Population sizes.')
+    parser.add_argument('--backends', nargs='+', default=['serial', 'thread', 'process'],
+                        choices=sorted(BACKENDS), help='Evaluation backends.')
+    parser.add_argument('--workers', nargs='+', type=int, default=[2, os.cpu_count() or 1],
+                        help='Numbers of workers of pool backends.')
+    parser.add_argument('--generations', type=int, default=5, help='Number of generations of every case.')
+    parser.add_argument('--genes', type=int, default=32, help='Number of genes in chromosome.')
+    parser.add_argument('--output', type=str, default='benchmark_results.json', help='Path to JSON with results.')
+    parser.add_argument('--compare', type=str, default=None, help='Path to JSON with previous results.')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Allowed relative slowdown of evaluations per second against previous results.')
+    return parser.parse_args()
+
+
+def main() -> int:
+    in_arg = get_input_args()
+    logger.remove()
+    logger.add(sys.stderr, level='WARNING')
+
+    results = run_benchmark(in_arg.problems, in_arg.sizes, in_arg.backends, in_arg.workers, in_arg.generations,
+                            in_arg.genes)
+    with open(in_arg.output, 'w') as file:
+        json.dump({
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': numpy.__version__,
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+            },
+            'arguments': vars(in_arg),
+            'results': results,
+        }, file, indent=2)
+    print(f"Results saved to {in_arg.output}")
+
+    if in_arg.compare:
+        with open(in_arg.compare) as file:
+            regressions = find_regressions(results, json.load(file)['results'], in_arg.tolerance)
+        for case, previous, current in regressions:
+            print(f"REGRESSION {case}: {previous:.0f} -> {current:.0f} eval/s")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Module contains reference implementations of GeneticFunctionsInterface used to benchmark genetic algorithm.
+
+Explanation:
+    OneMax - chromosome is a tuple of bits, fitness is number of ones (cheap CPU bound fitness).
+    DiscreteRastrigin - chromosome is a point on grid from the configuration dictionary, fitness is negated
+                        Rastrigin function (CPU bound fitness, also in version with ArrayPopulation
+                        and vectorized count_fitness_batch).
+    SleepFitness - fitness of OneMax returned after sleep (I/O bound fitness with count_fitness_async).
+
+Every problem runs fixed number of generations, so runs with different backends do the same amount of work.
+All problems are defined on module level, so they can be sent to the worker processes.
+"""
+import asyncio
+import math
+import random
+import time
+
+import numpy
+
+import gom.genetic_logic.functions_interface as genetic_interface
+from gom.genetic_logic import array_population
+
+PROBABILITY_CROSSOVER = 0.9
+PROBABILITY_MUTATION = 0.1
+TOURNAMENT_SIZE = 2
+
+
+class FixedGenerationsProblem(genetic_interface.GeneticFunctionsInterface):
+    """Base for benchmark problems with tournament selection, one point crossover and fixed number of generations."""
+
+    def __init__(self, population_size: int, number_of_genes: int, generations: int):
+        """
+        Construct benchmark problem.
+
+        :param population_size: number of chromosomes in population.
+        :param number_of_genes: number of genes in chromosome.
+        :param generations: number of generations after which run stops.
+        """
+        super().__init__()
+        self.population_size = population_size
+        self.number_of_genes = number_of_genes
+        self.generations = generations
+        self.generation = 0
+        # GeneticAlgorithm reads probabilities as attributes
+        self.probability_crossover = PROBABILITY_CROSSOVER
+        self.probability_mutation = PROBABILITY_MUTATION
+
+    def probability_crossover(self) -> float:
+        return PROBABILITY_CROSSOVER
+
+    def probability_mutation(self) -> float:
+        return PROBABILITY_MUTATION
+
+    def check_stop_conditions(self, fitness_and_chromosomes: list) -> bool:
+        self.generation += 1
+        return self.generation >= self.generations
+
+    def choose_parents(self, fitness_and_chromosomes: list) -> (list, list):
+        while True:
+            yield (
+                max(random.sample(fitness_and_chromosomes, TOURNAMENT_SIZE), key=lambda pair: pair[0])[1],
+                max(random.sample(fitness_and_chromosomes, TOURNAMENT_SIZE), key=lambda pair: pair[0])[1]
+            )
+
+    def crossover(self, parents: (list, list)) -> (list, list):
+        cut = random.randrange(1, max(self.number_of_genes, 2))
+        return parents[0][:cut] + parents[1][cut:], parents[1][:cut] + parents[0][cut:]
+
+
+class OneMax(FixedGenerationsProblem):
+    """Maximize number of ones in chromosome of bits."""
+
+    def generate_initial_population(self) -> list:
+        return [
+            tuple(random.getrandbits(1) for _ in range(self.number_of_genes)) for _ in range(self.population_size)
+        ]
+
+    def count_fitness(self, chromosome: list) -> int:
+        return sum(chromosome)
+
+    def mutate(self, chromosome: list) -> list:
+        gene = random.randrange(self.number_of_genes)
+        return chromosome[:gene] + (1 - chromosome[gene],) + chromosome[gene + 1:]
+
+
+class VectorizedOneMax(OneMax):
+    """OneMax with vectorized count_fitness_batch."""
+
+    def count_fitness_batch(self, population_array: numpy.ndarray) -> numpy.ndarray:
+        return population_array.sum(axis=1)
+
+
+class DiscreteRastrigin(FixedGenerationsProblem):
+    """Maximize negated Rastrigin function over grid [-5.12, 5.12] with step 0.01 in every dimension."""
+
+    # values on grid are integers, real coordinate is value * SCALE
+    SCALE = 0.01
+
+    def __init__(self, population_size: int, number_of_genes: int, generations: int):
+        """
+        Construct benchmark problem.
+
+        :param population_size: number of chromosomes in population.
+        :param number_of_genes: number of dimensions of Rastrigin function.
+        :param generations: number of generations after which run stops.
+        """
+        super().__init__(population_size, number_of_genes, generations)
+        self.configuration = {f'x{index}': [-512, 513, 1, 10] for index in range(number_of_genes)}
+
+    def generate_initial_population(self) -> list:
+        return array_population.ArrayPopulation.from_configuration(self.configuration, self.population_size).to_list()
+
+    def count_fitness(self, chromosome: list) -> float:
+        coordinates = [value * self.SCALE for value in chromosome]
+        return -(10 * len(coordinates) + sum(x * x - 10 * math.cos(2 * math.pi * x) for x in coordinates))
+
+    def mutate(self, chromosome: list) -> list:
+        gene = random.randrange(self.number_of_genes)
+        value = min(max(chromosome[gene] + random.randint(-10, 10), -512), 512)
+        return chromosome[:gene] + (value,) + chromosome[gene + 1:]
+
+
+class VectorizedDiscreteRastrigin(DiscreteRastrigin):
+    """DiscreteRastrigin with ArrayPopulation and vectorized count_fitness_batch."""
+
+    def generate_initial_population(self) -> array_population.ArrayPopulation:
+        return array_population.ArrayPopulation.from_configuration(
+            self.configuration, self.population_size, crossover_method='one_point'
+        )
+
+    def count_fitness_batch(self, population_array: numpy.ndarray) -> numpy.ndarray:
+        coordinates = population_array * self.SCALE
+        return -(10 * coordinates.shape[1] + (coordinates ** 2 - 10 * numpy.cos(2 * numpy.pi * coordinates)).sum(axis=1))
+
+
+class SleepFitness(OneMax):
+    """OneMax which waits before returning fitness value, like fitness counted by simulator or service."""
+
+    def __init__(self, population_size: int, number_of_genes: int, generations: int, delay: float = 0.001):
+        """
+        Construct benchmark problem.
+
+        :param population_size: number of chromosomes in population.
+        :param number_of_genes: number of genes in chromosome.
+        :param generations: number of generations after which run stops.
+        :param delay: time of one evaluation in seconds.
+        """
+        super().__init__(population_size, number_of_genes, generations)
+        self.delay = delay
+
+    def count_fitness(self, chromosome: list) -> int:
+        time.sleep(self.delay)
+        return sum(chromosome)
+
+    async def count_fitness_async(self, chromosome: list) -> int:
+        await asyncio.sleep(self.delay)
+        return sum(chromosome)
+
+
+PROBLEMS = {
+    'onemax': OneMax,
+    'onemax_vectorized': VectorizedOneMax,
+    'rastrigin': DiscreteRastrigin,
+    'rastrigin_vectorized': VectorizedDiscreteRastrigin,
+    'sleep': SleepFitness,
+}
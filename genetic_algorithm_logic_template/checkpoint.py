@@ -0,0 +1,107 @@
+"""
+Module contains checkpointing of genetic algorithm, so long runs can be resumed after crash.
+
+Checkpoint is one binary pickle file (highest protocol, NumPy arrays are stored as raw buffers) with evaluated
+population, fitness values, the best solutions, state of random generators and counters of generations.
+File is written to temporary file and moved over the old checkpoint, so checkpoint is never half written.
+
+Example:
+    >>>from gom.genetic_logic import checkpoint
+    >>>checkpointer = checkpoint.Checkpointer('run.ckpt', every_generations=10, every_seconds=600)
+    >>>algorithm = GeneticAlgorithm(genetics, checkpointer=checkpointer)
+    >>>algorithm.run()
+    >>># after crash
+    >>>algorithm = GeneticAlgorithm(genetics, checkpointer=checkpointer)
+    >>>algorithm.resume('run.ckpt')
+
+"""
+import os
+import pickle
+import tempfile
+import time
+
+from loguru import logger
+
+FORMAT_VERSION = 1
+
+
+def save_checkpoint(path: str, state: dict) -> None:
+    """
+    Write state atomically to the checkpoint file.
+
+    :param path: path to the checkpoint file.
+    :param state: picklable state of genetic algorithm.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file:
+            pickle.dump({'format_version': FORMAT_VERSION, 'state': state}, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Read state of genetic algorithm from the checkpoint file.
+
+    :param path: path to the checkpoint file.
+
+    :raise ValueError: Raise exception if checkpoint has unsupported format version.
+
+    :return dict: state of genetic algorithm.
+    """
+    with open(path, 'rb') as file:
+        checkpoint = pickle.load(file)
+    if checkpoint.get('format_version') != FORMAT_VERSION:
+        msg = f'Checkpoint {path} has unsupported format version {checkpoint.get("format_version")}.'
+        logger.error(msg)
+        raise ValueError(msg)
+    return checkpoint['state']
+
+
+class Checkpointer(object):
+    """Decide when to write checkpoint of genetic algorithm and write it."""
+
+    def __init__(self, path: str, every_generations: int = None, every_seconds: float = None):
+        """
+        Construct object of Checkpointer.
+
+        :param path: path to the checkpoint file.
+        :param every_generations: write checkpoint every this number of generations.
+        :param every_seconds: write checkpoint when this number of seconds passed from the last one.
+
+        :return Checkpointer: instance of class Checkpointer.
+        """
+        self.path = path
+        self.every_generations = every_generations
+        self.every_seconds = every_seconds
+        self._last_save_time = time.monotonic()
+
+    def is_due(self, generation: int) -> bool:
+        """
+        Check if checkpoint should be written after passed generation.
+
+        :param generation: number of evaluated generations.
+
+        :return bool: True if checkpoint should be written.
+        """
+        if self.every_generations and generation % self.every_generations == 0:
+            return True
+        return bool(self.every_seconds) and time.monotonic() - self._last_save_time >= self.every_seconds
+
+    def save(self, state: dict) -> None:
+        """
+        Write checkpoint.
+
+        :param state: picklable state of genetic algorithm.
+        """
+        checkpoint_start = time.perf_counter()
+        save_checkpoint(self.path, state)
+        self._last_save_time = time.monotonic()
+        logger.debug(f"Checkpoint saved to {self.path} in {time.perf_counter() - checkpoint_start:.3f}s.")
@@ -0,0 +1,90 @@
+"""
+Module contains hall of fame keeping the best chromosomes found by genetic algorithm.
+
+Hall of fame is updated with partial selection (heapq.nlargest) of each generation instead of sorting it,
+so update costs O(N log K) for population of N chromosomes and hall of fame of size K.
+Higher fitness value means better chromosome.
+
+Example:
+    >>>from gom.genetic_logic import elitism
+    >>>hall_of_fame = elitism.HallOfFame(size=5)
+    >>>hall_of_fame.update(fitness_and_chromosomes)
+    >>>best_fitness, best_chromosome = hall_of_fame.best
+
+"""
+import heapq
+import itertools
+
+from gom.genetic_logic.fitness_cache import FitnessCache
+
+
+def select_best(fitness_and_chromosomes: list, number: int) -> list:
+    """
+    Select the best pairs without sorting the whole list.
+
+    :param fitness_and_chromosomes: list of (fitness_value, chromosome).
+    :param number: number of pairs to select.
+
+    :return list: the best (fitness_value, chromosome) pairs, the best first.
+    """
+    return heapq.nlargest(number, fitness_and_chromosomes, key=lambda pair: pair[0])
+
+
+class HallOfFame(object):
+    """The best distinct chromosomes found over all generations."""
+
+    def __init__(self, size: int = 5):
+        """
+        Construct object of HallOfFame.
+
+        :param size: maximal number of chromosomes kept.
+
+        :return HallOfFame: instance of class HallOfFame.
+        """
+        self.size = size
+        # min-heap of (fitness_value, insertion counter, key, chromosome), the worst member on top
+        self._heap = []
+        self._keys = set()
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def best(self) -> tuple:
+        """
+        The best (fitness_value, chromosome) found so far or None when hall of fame is empty.
+        """
+        if not self._heap:
+            return None
+        fitness_value, _, _, chromosome = max(self._heap, key=lambda entry: (entry[0], -entry[1]))
+        return fitness_value, chromosome
+
+    def items(self) -> list:
+        """
+        Get members of hall of fame.
+
+        :return list: (fitness_value, chromosome) pairs, the best first.
+        """
+        entries = sorted(self._heap, key=lambda entry: (-entry[0], entry[1]))
+        return [(fitness_value, chromosome) for fitness_value, _, _, chromosome in entries]
+
+    def update(self, fitness_and_chromosomes: list) -> None:
+        """
+        Add the best chromosomes of generation which are better than the worst member of hall of fame.
+
+        :param fitness_and_chromosomes: list of (fitness_value, chromosome).
+        """
+        for fitness_value, chromosome in select_best(fitness_and_chromosomes, self.size):
+            if len(self._heap) == self.size and fitness_value <= self._heap[0][0]:
+                break
+            key = FitnessCache.make_key(chromosome)
+            if key in self._keys:
+                continue
+            entry = (fitness_value, next(self._counter), key, chromosome)
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, entry)
+            else:
+                removed = heapq.heapreplace(self._heap, entry)
+                self._keys.discard(removed[2])
+            self._keys.add(key)
@@ -0,0 +1,486 @@
+"""
+The module contains backends used by genetic algorithm to count fitness values of chromosomes.
+
+Every backend implements EvaluatorInterface. Pool based backends keep their pool alive between generations,
+so workers are created once per run of genetic algorithm instead of once per generation.
+Explanation:
+    SerialEvaluator - counts fitness values one by one in the main thread.
+    ThreadPoolEvaluator - counts fitness values in persistent pool of threads (good for I/O bound fitness).
+    ProcessPoolEvaluator - counts fitness values in persistent pool of processes (good for CPU bound fitness).
+    AsyncioEvaluator - awaits asynchronous fitness function in event loop with bounded concurrency, timeouts and
+                       retries (good for fitness counted by simulators or services over sockets).
+
+Example:
+    Evaluator can be used as a context manager to keep the pool alive for many evaluations
+    >>>from gom.genetic_logic import evaluators
+    >>>with evaluators.ProcessPoolEvaluator(number_of_workers=4) as evaluator:
+    >>>    fitness_values = evaluator.evaluate(genetics.count_fitness, population)
+    >>>    fitness_array = evaluator.evaluate_batch(genetics.count_fitness_batch, population_array)
+
+"""
+import abc
+import asyncio
+import concurrent.futures
+import math
+import os
+import time
+
+import numpy
+from loguru import logger
+
+
+def count_fitness_of_chunk(count_fitness, chromosomes: list) -> list:
+    """
+    Count fitness values for the chunk of chromosomes.
+
+    Function is defined on module level so it can be sent to the worker processes.
+
+    :param count_fitness: function counting fitness value of one chromosome.
+    :param chromosomes: chunk of chromosomes from the population.
+
+    :return list: fitness values in the same order as chromosomes.
+    """
+    return [count_fitness(chromosome) for chromosome in chromosomes]
+
+
+def timed_call(function, *args) -> (object, float):
+    """
+    Call function and measure how long it was running. Used to count busy time of workers.
+
+    :param function: function to call (defined on module level when sent to the worker processes).
+    :param args: arguments of the function.
+
+    :return object, float: result of the function and its run time in seconds.
+    """
+    call_start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - call_start
+
+
+def count_fitness_of_array(count_fitness_batch, population_array: numpy.ndarray) -> numpy.ndarray:
+    """
+    Count fitness values for 2-D array of chromosomes with vectorized function.
+
+    :param count_fitness_batch: function counting fitness values of all rows at once.
+    :param population_array: 2-D array with one chromosome per row.
+
+    :raise ValueError: Raise exception if function does not return one fitness value per row.
+
+    :return numpy.ndarray: 1-D array of fitness values in the same order as rows.
+    """
+    fitness_values = numpy.asarray(count_fitness_batch(population_array)).reshape(-1)
+    if len(fitness_values) != len(population_array):
+        raise ValueError(f'count_fitness_batch returned {len(fitness_values)} values for '
+                         f'{len(population_array)} chromosomes.')
+    return fitness_values
+
+
+class EvaluatorInterface(abc.ABC):
+    """Interface for all backends counting fitness values of population."""
+
+    # evaluator expects coroutine function (count_fitness_async) instead of count_fitness
+    asynchronous = False
+    # number of evaluations which may run at once and total time spent by them in evaluations (for telemetry)
+    number_of_workers = 1
+    busy_time = 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def start(self) -> None:
+        """
+        Prepare resources (e.g. pool of workers) used by evaluator.
+        """
+
+    def shutdown(self) -> None:
+        """
+        Release resources (e.g. pool of workers) used by evaluator.
+        """
+
+    @abc.abstractmethod
+    def evaluate(self, count_fitness, population: list, on_result=None) -> list:
+        """
+        Count fitness values for the whole population.
+
+        :param count_fitness: function counting fitness value of one chromosome.
+        :param population: list of chromosomes in population.
+        :param on_result: function called with (index, fitness_value) for every counted chromosome; when it returns
+                          True evaluation stops and chromosomes not counted yet get None as fitness value.
+
+        :return list: fitness values in the same order as chromosomes in population.
+        """
+
+    def evaluate_batch(self, count_fitness_batch, population_array: numpy.ndarray) -> numpy.ndarray:
+        """
+        Count fitness values for the whole population with vectorized function.
+
+        :param count_fitness_batch: function counting fitness values of all rows at once.
+        :param population_array: 2-D array with one chromosome per row.
+
+        :return numpy.ndarray: 1-D array of fitness values in the same order as rows.
+        """
+        fitness_values, busy_time = timed_call(count_fitness_of_array, count_fitness_batch, population_array)
+        self.busy_time += busy_time
+        return fitness_values
+
+
+class SerialEvaluator(EvaluatorInterface):
+    """Count fitness values one by one in the main thread."""
+
+    def evaluate(self, count_fitness, population: list, on_result=None) -> list:
+        """
+        Count fitness values for the whole population.
+
+        :param count_fitness: function counting fitness value of one chromosome.
+        :param population: list of chromosomes in population.
+        :param on_result: function called with (index, fitness_value) for every counted chromosome; when it returns
+                          True evaluation stops and chromosomes not counted yet get None as fitness value.
+
+        :return list: fitness values in the same order as chromosomes in population.
+        """
+        if on_result is None:
+            fitness_values, busy_time = timed_call(count_fitness_of_chunk, count_fitness, population)
+            self.busy_time += busy_time
+            return fitness_values
+
+        fitness_values = [None] * len(population)
+        evaluation_start = time.perf_counter()
+        for index, chromosome in enumerate(population):
+            fitness_values[index] = count_fitness(chromosome)
+            if on_result(index, fitness_values[index]):
+                logger.debug(f"Evaluation stopped after {index + 1} of {len(population)} chromosomes.")
+                break
+        self.busy_time += time.perf_counter() - evaluation_start
+        return fitness_values
+
+
+class PoolEvaluator(EvaluatorInterface):
+    """Base for evaluators counting fitness values in persistent pool of workers."""
+
+    def __init__(self, number_of_workers: int = None, chunk_size: int = None):
+        """
+        Construct pool evaluator.
+
+        :param number_of_workers: number of workers in pool (default: number of CPUs).
+        :param chunk_size: number of chromosomes sent to worker at once (default: about four chunks per worker).
+        """
+        self.number_of_workers = number_of_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    @abc.abstractmethod
+    def _create_executor(self) -> concurrent.futures.Executor:
+        """
+        Create pool of workers.
+
+        :return concurrent.futures.Executor: pool of workers.
+        """
+
+    def start(self) -> None:
+        """
+        Create pool of workers if it is not running yet.
+        """
+        if self._executor is None:
+            logger.debug(f"Starting {type(self).__name__} with {self.number_of_workers} workers.")
+            self._executor = self._create_executor()
+
+    def shutdown(self) -> None:
+        """
+        Stop pool of workers.
+        """
+        if self._executor is not None:
+            logger.debug(f"Stopping {type(self).__name__}.")
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_chunk_size(self, population_size: int) -> int:
+        """
+        Get number of chromosomes sent to worker at once.
+
+        :param population_size: number of chromosomes to evaluate.
+
+        :return int: size of one chunk.
+        """
+        if self.chunk_size:
+            return self.chunk_size
+        return max(1, math.ceil(population_size / (self.number_of_workers * 4)))
+
+    def evaluate(self, count_fitness, population: list, on_result=None) -> list:
+        """
+        Count fitness values for the whole population.
+
+        Population is split into chunks submitted at once and results are collected as they finish.
+        When pool is not running it is started only for this call.
+
+        :param count_fitness: function counting fitness value of one chromosome.
+        :param population: list of chromosomes in population.
+        :param on_result: function called with (index, fitness_value) for every counted chromosome; when it returns
+                          True chunks not started yet are cancelled and chromosomes not counted yet get None as fitness value.
+
+        :return list: fitness values in the same order as chromosomes in population.
+        """
+        started_here = self._executor is None
+        if started_here:
+            self.start()
+        try:
+            return self._evaluate_in_chunks(count_fitness, population, on_result)
+        finally:
+            if started_here:
+                self.shutdown()
+
+    def _evaluate_in_chunks(self, count_fitness, population: list, on_result=None) -> list:
+        """
+        Submit chunks of population to pool and collect fitness values as they finish.
+
+        :param count_fitness: function counting fitness value of one chromosome.
+        :param population: list of chromosomes in population.
+        :param on_result: function called with (index, fitness_value), evaluation stops when it returns True.
+
+        :return list: fitness values in the same order as chromosomes in population.
+        """
+        fitness_values = [None] * len(population)
+        chunk_size = self._get_chunk_size(len(population))
+        futures = {}
+        for start in range(0, len(population), chunk_size):
+            chunk = list(population[start:start + chunk_size])
+            futures[self._executor.submit(timed_call, count_fitness_of_chunk, count_fitness, chunk)] = start
+        logger.debug(f"Submitted {len(population)} chromosomes in {len(futures)} chunks.")
+
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                start = futures[future]
+                chunk_fitness_values, busy_time = future.result()
+                self.busy_time += busy_time
+                fitness_values[start:start + len(chunk_fitness_values)] = chunk_fitness_values
+                if on_result is not None:
+                    stop = [on_result(start + offset, value) for offset, value in enumerate(chunk_fitness_values)]
+                    if any(stop):
+                        logger.debug("Evaluation stopped, cancelling chunks not started yet.")
+                        for pending_future in futures:
+                            pending_future.cancel()
+                        break
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+        return fitness_values
+
+    def evaluate_batch(self, count_fitness_batch, population_array: numpy.ndarray) -> numpy.ndarray:
+        """
+        Count fitness values for the whole population with vectorized function.
+
+        Array is split into one block of rows per worker, so vectorized function runs on all workers at once.
+
+        :param count_fitness_batch: function counting fitness values of all rows at once.
+        :param population_array: 2-D array with one chromosome per row.
+
+        :return numpy.ndarray: 1-D array of fitness values in the same order as rows.
+        """
+        if self.number_of_workers < 2 or len(population_array) < 2 * self.number_of_workers:
+            return super().evaluate_batch(count_fitness_batch, population_array)
+
+        started_here = self._executor is None
+        if started_here:
+            self.start()
+        try:
+            blocks = numpy.array_split(population_array, self.number_of_workers)
+            futures = [
+                self._executor.submit(timed_call, count_fitness_of_array, count_fitness_batch, block) for block in blocks
+            ]
+            results = [future.result() for future in futures]
+            self.busy_time += sum(busy_time for _, busy_time in results)
+            return numpy.concatenate([fitness_values for fitness_values, _ in results])
+        finally:
+            if started_here:
+                self.shutdown()
+
+
+class ThreadPoolEvaluator(PoolEvaluator):
+    """Count fitness values in persistent pool of threads."""
+
+    def _create_executor(self) -> concurrent.futures.Executor:
+        """
+        Create pool of threads.
+
+        :return concurrent.futures.Executor: pool of threads.
+        """
+        return concurrent.futures.ThreadPoolExecutor(max_workers=self.number_of_workers)
+
+
+class ProcessPoolEvaluator(PoolEvaluator):
+    """
+    Count fitness values in persistent pool of processes.
+
+    Function counting fitness (and object it is bound to) and chromosomes have to be picklable.
+    """
+
+    def __init__(self, number_of_workers: int = None, chunk_size: int = None, mp_context=None):
+        """
+        Construct process pool evaluator.
+
+        :param number_of_workers: number of processes in pool (default: number of CPUs).
+        :param chunk_size: number of chromosomes sent to process at once (default: about four chunks per worker).
+        :param mp_context: multiprocessing context used to start processes (default: platform default).
+        """
+        super().__init__(number_of_workers=number_of_workers, chunk_size=chunk_size)
+        self.mp_context = mp_context
+
+    def _create_executor(self) -> concurrent.futures.Executor:
+        """
+        Create pool of processes.
+
+        :return concurrent.futures.Executor: pool of processes.
+        """
+        return concurrent.futures.ProcessPoolExecutor(max_workers=self.number_of_workers, mp_context=self.mp_context)
+
+
+class AsyncioEvaluator(EvaluatorInterface):
+    """
+    Await asynchronous fitness function for the whole population in persistent event loop.
+
+    Event loop runs in the thread calling evaluate, so genetic algorithm must not be run inside running event loop.
+    """
+
+    asynchronous = True
+
+    def __init__(self, max_concurrency: int = 100, timeout: float = None, retries: int = 0, retry_delay: float = 0.0):
+        """
+        Construct asyncio evaluator.
+
+        :param max_concurrency: maximal number of evaluations in flight at once.
+        :param timeout: maximal time of one evaluation in seconds (default: no timeout).
+        :param retries: number of retries of failed or timed out evaluation.
+        :param retry_delay: delay before first retry in seconds, doubled with every next retry.
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.number_of_workers = max_concurrency
+        self._loop = None
+
+    def start(self) -> None:
+        """
+        Create event loop if it is not running yet.
+        """
+        if self._loop is None:
+            logger.debug(f"Starting {type(self).__name__} with {self.max_concurrency} concurrent evaluations.")
+            self._loop = asyncio.new_event_loop()
+
+    def shutdown(self) -> None:
+        """
+        Close event loop.
+        """
+        if self._loop is not None:
+            logger.debug(f"Stopping {type(self).__name__}.")
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.run_until_complete(self._loop.shutdown_default_executor())
+            self._loop.close()
+            self._loop = None
+
+    def evaluate(self, count_fitness_async, population: list, on_result=None) -> list:
+        """
+        Count fitness values for the whole population.
+
+        :param count_fitness_async: coroutine function counting fitness value of one chromosome.
+        :param population: list of chromosomes in population.
+        :param on_result: function called with (index, fitness_value) for every counted chromosome; when it returns
+                          True evaluations in flight are cancelled and chromosomes not counted yet get None as fitness value.
+
+        :return list: fitness values in the same order as chromosomes in population.
+        """
+        started_here = self._loop is None
+        if started_here:
+            self.start()
+        try:
+            return self._loop.run_until_complete(self._evaluate_all(count_fitness_async, population, on_result))
+        finally:
+            if started_here:
+                self.shutdown()
+
+    async def _evaluate_all(self, count_fitness_async, population: list, on_result=None) -> list:
+        """
+        Schedule evaluations of all chromosomes limited by semaphore and wait for all of them.
+
+        :param count_fitness_async: coroutine function counting fitness value of one chromosome.
+        :param population: list of chromosomes in population.
+        :param on_result: function called with (index, fitness_value), evaluation stops when it returns True.
+
+        :return list: fitness values in the same order as chromosomes in population.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._evaluate_one(count_fitness_async, index, chromosome, semaphore))
+            for index, chromosome in enumerate(population)
+        ]
+        fitness_values = [None] * len(population)
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                index, fitness_value = await next_result
+                fitness_values[index] = fitness_value
+                if on_result is not None and on_result(index, fitness_value):
+                    logger.debug("Evaluation stopped, cancelling evaluations in flight.")
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return fitness_values
+
+    async def _evaluate_one(self, count_fitness_async, index: int, chromosome,
+                            semaphore: asyncio.Semaphore) -> (int, object):
+        """
+        Evaluate one chromosome when semaphore allows it and count time it was in flight.
+
+        :param count_fitness_async: coroutine function counting fitness value of one chromosome.
+        :param index: index of chromosome in population.
+        :param chromosome: one individual from the population.
+        :param semaphore: semaphore limiting number of evaluations in flight.
+
+        :return int, object: index and fitness value of chromosome.
+        """
+        async with semaphore:
+            evaluation_start = time.perf_counter()
+            try:
+                return index, await self._evaluate_with_retries(count_fitness_async, chromosome)
+            finally:
+                self.busy_time += time.perf_counter() - evaluation_start
+
+    async def _evaluate_with_retries(self, count_fitness_async, chromosome):
+        """
+        Evaluate one chromosome with timeout and retries.
+
+        :param count_fitness_async: coroutine function counting fitness value of one chromosome.
+        :param chromosome: one individual from the population.
+
+        :raise Exception: Raise exception of the last attempt when all retries failed.
+
+        :return: fitness value of chromosome.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                return await asyncio.wait_for(count_fitness_async(chromosome), self.timeout)
+            except Exception as e:
+                if attempt == self.retries:
+                    logger.error(f"Evaluation of {chromosome} failed after {attempt + 1} attempts: {e!r}")
+                    raise
+                logger.warning(f"Evaluation of {chromosome} failed (attempt {attempt + 1}): {e!r}. Retrying.")
+                await asyncio.sleep(self.retry_delay * 2 ** attempt)
+
+
+def get_default_evaluator(number_of_threads: int) -> EvaluatorInterface:
+    """
+    Get evaluator matching the old behaviour based on number of threads.
+
+    :param number_of_threads: number of threads requested by implementation of GeneticFunctionsInterface.
+
+    :return EvaluatorInterface: serial evaluator for less than two threads, thread pool evaluator otherwise.
+    """
+    if number_of_threads < 2:
+        return SerialEvaluator()
+    return ThreadPoolEvaluator(number_of_workers=number_of_threads)
@@ -0,0 +1,140 @@
+"""
+Module contains cache of fitness values for genetic algorithm.
+
+Chromosomes in the discrete search space repeat very often (parents passing to the next generation without
+crossover or mutation, duplicates in population), so fitness value of each chromosome is counted only once.
+Cache keeps the most recently used fitness values in memory (LRU eviction) and optionally stores all of them
+in sqlite database, so restarted or repeated experiments reuse earlier evaluations.
+
+Example:
+    Cache may be passed to genetic algorithm
+    >>>from gom.genetic_logic import fitness_cache
+    >>>cache = fitness_cache.FitnessCache(max_size=100000, path='fitness_cache.sqlite')
+    >>>algorithm = GeneticAlgorithm(genetics, fitness_cache=cache)
+    >>>algorithm.run()
+    >>>print(algorithm.cache_hits, algorithm.cache_misses)
+
+"""
+import collections
+import pickle
+import sqlite3
+
+from loguru import logger
+
+
+class FitnessCache(object):
+    """Bounded LRU cache of fitness values keyed by chromosome with optional persistent sqlite tier."""
+
+    def __init__(self, max_size: int = 100000, path: str = None):
+        """
+        Construct object of FitnessCache.
+
+        :param max_size: maximal number of fitness values kept in memory.
+        :param path: path to sqlite database with persistent fitness values (default: memory only).
+
+        :return FitnessCache: instance of class FitnessCache.
+        """
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = collections.OrderedDict()
+        self._connection = None
+        if path:
+            logger.debug(f"Opening persistent fitness cache: {path}")
+            self._connection = sqlite3.connect(path)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS fitness (chromosome TEXT PRIMARY KEY, fitness BLOB NOT NULL)'
+            )
+            self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @staticmethod
+    def make_key(chromosome) -> tuple:
+        """
+        Make hashable key from chromosome.
+
+        :param chromosome: one individual from the population (tuple, list or NumPy row).
+
+        :return tuple: key of chromosome.
+        """
+        if hasattr(chromosome, 'tolist'):
+            chromosome = chromosome.tolist()
+        return tuple(chromosome)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Part of lookups answered from cache (0.0-1.0).
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: tuple) -> (bool, object):
+        """
+        Get fitness value of chromosome and count hit or miss.
+
+        :param key: key of chromosome made by make_key.
+
+        :return bool, object: flag if fitness value was found and the fitness value.
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return True, self._memory[key]
+
+        if self._connection is not None:
+            row = self._connection.execute('SELECT fitness FROM fitness WHERE chromosome = ?', (repr(key),)).fetchone()
+            if row is not None:
+                fitness_value = pickle.loads(row[0])
+                self._remember(key, fitness_value)
+                self.hits += 1
+                return True, fitness_value
+
+        self.misses += 1
+        return False, None
+
+    def put_many(self, keys: list, fitness_values: list) -> None:
+        """
+        Store fitness values of chromosomes.
+
+        :param keys: keys of chromosomes made by make_key.
+        :param fitness_values: fitness values in the same order as keys.
+        """
+        for key, fitness_value in zip(keys, fitness_values):
+            self._remember(key, fitness_value)
+
+        if self._connection is not None:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO fitness (chromosome, fitness) VALUES (?, ?)',
+                [(repr(key), pickle.dumps(fitness_value)) for key, fitness_value in zip(keys, fitness_values)]
+            )
+            self._connection.commit()
+
+    def _remember(self, key: tuple, fitness_value) -> None:
+        """
+        Store fitness value in memory and evict least recently used one when cache is full.
+
+        :param key: key of chromosome made by make_key.
+        :param fitness_value: fitness value of chromosome.
+        """
+        self._memory[key] = fitness_value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def close(self) -> None:
+        """
+        Close persistent tier of cache.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,5 +1,6 @@
 """The module contains interface for all base functionality for genetic algorithms."""
 import abc
+import asyncio
 
 
 class GeneticFunctionsInterface(abc.ABC):
@@ -43,6 +44,32 @@ class GeneticFunctionsInterface(abc.ABC):
 
         """
 
+    async def count_fitness_async(self, chromosome: list) -> int:
+        """
+        Returns domain fitness value of chromosome without blocking the event loop (optional).
+
+        Used by AsyncioEvaluator. Override it when fitness is counted by I/O (simulators, services over sockets),
+        so hundreds of evaluations can be in flight at once. By default count_fitness runs in a thread.
+
+        :param chromosome: one individual from the population.
+
+        :return int: fitness value of chromosome.
+        """
+        return await asyncio.to_thread(self.count_fitness, chromosome)
+
+    def count_fitness_batch(self, population_array):
+        """
+        Returns domain fitness values of the whole population at once (optional).
+
+        Implement it when fitness can be counted with vectorized NumPy operations.
+        When implemented genetic algorithm uses it instead of count_fitness.
+
+        :param population_array: 2-D NumPy array with one chromosome per row.
+
+        :return numpy.ndarray: 1-D array with fitness value for each row.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def check_stop_conditions(self, fitness_and_chromosomes: list) -> bool:
         """
@@ -82,3 +109,14 @@ class GeneticFunctionsInterface(abc.ABC):
 
         :return list: mutated chromosome.
         """
+
+
+def implements_count_fitness_batch(genetics: GeneticFunctionsInterface) -> bool:
+    """
+    Check if implementation of the interface provides vectorized count_fitness_batch.
+
+    :param genetics: implementation of interface GeneticFunctions.
+
+    :return bool: True if count_fitness_batch is overridden.
+    """
+    return type(genetics).count_fitness_batch is not GeneticFunctionsInterface.count_fitness_batch
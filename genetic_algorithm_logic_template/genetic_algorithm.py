@@ -1,29 +1,90 @@
 """
-The module contains functionality needed to run genetic algorithm with calculation of chromosomes in separate threads.
+The module contains functionality needed to run genetic algorithm with calculation of chromosomes in pluggable
+evaluation backend (serial, pool of threads or pool of processes).
 """
-import concurrent.futures
 import random
+import time
 
+import numpy
 from loguru import logger
 
 import gom.genetic_logic.functions_interface as genetic_interface
+from gom.genetic_logic import array_population
+from gom.genetic_logic import checkpoint
+from gom.genetic_logic import elitism
+from gom.genetic_logic import evaluators
+from gom.genetic_logic import fitness_cache as cache_module
 from gom.genetic_logic import helper_functions as helper
+from gom.genetic_logic import metrics
+from gom.genetic_logic import stop_criteria as criteria_module
 
 
 class GeneticAlgorithm(object):
-    def __init__(self, genetics: genetic_interface.GeneticFunctionsInterface):
+    def __init__(self, genetics: genetic_interface.GeneticFunctionsInterface,
+                 evaluator: evaluators.EvaluatorInterface = None,
+                 fitness_cache: cache_module.FitnessCache = None,
+                 elite_size: int = 0,
+                 hall_of_fame_size: int = 5,
+                 checkpointer: checkpoint.Checkpointer = None,
+                 metrics_sink: metrics.MetricsSinkInterface = None,
+                 stop_criteria: criteria_module.StopCriterionInterface = None):
         """
         Construct object of GeneticAlgorithm.
 
         :param genetics: implementation of interface GeneticFunctions.
+        :param evaluator: backend counting fitness values (default: serial or thread pool based on
+                          genetics.number_of_threads). When genetics implements count_fitness_batch
+                          the whole population is evaluated with one vectorized call per worker.
+        :param fitness_cache: cache of fitness values, so each chromosome is evaluated only once (default: no cache).
+        :param elite_size: number of the best chromosomes carried unchanged (and not evaluated again)
+                           into the next generation.
+        :param hall_of_fame_size: number of the best distinct chromosomes remembered over all generations.
+        :param checkpointer: writes checkpoints of evaluated generations, so run can be resumed (default: none).
+                             Genetics and chromosomes have to be picklable.
+        :param metrics_sink: destination of per generation telemetry (default: telemetry is not written).
+        :param stop_criteria: built-in stop criterion (or list of criteria, any of them stops the run) checked
+                              before genetics.check_stop_conditions, also during evaluation of generation.
 
         :return GeneticAlgorithm: instance of class GeneticAlgorithm.
         """
         self.genetics = genetics
+        if evaluator is None:
+            evaluator = evaluators.get_default_evaluator(getattr(genetics, 'number_of_threads', 1))
+        self.evaluator = evaluator
+        self.batch_fitness = genetic_interface.implements_count_fitness_batch(genetics)
+        self.fitness_cache = fitness_cache
         self.initial_population = None
         self.dict_pop = dict()
         self.fitness_and_chromosomes = list()
+        self.fitness_values = list()
         self.best_solution = None
+        self.elite_size = elite_size
+        self.elites = list()
+        self.hall_of_fame = elitism.HallOfFame(hall_of_fame_size)
+        self._carried_fitness_values = list()
+        self.checkpointer = checkpointer
+        self.generation = 0
+        self.evaluations = 0
+        self.metrics_sink = metrics_sink
+        self.phase_times = dict.fromkeys(('evaluation', 'selection', 'crossover', 'mutation'), 0.0)
+        if isinstance(stop_criteria, (list, tuple)):
+            stop_criteria = criteria_module.AnyOf(*stop_criteria)
+        self.stop_criteria = stop_criteria
+        self.evaluation_stopped = False
+
+    @property
+    def cache_hits(self) -> int:
+        """
+        Number of fitness values taken from the cache.
+        """
+        return self.fitness_cache.hits if self.fitness_cache is not None else 0
+
+    @property
+    def cache_misses(self) -> int:
+        """
+        Number of fitness values which had to be counted despite the cache.
+        """
+        return self.fitness_cache.misses if self.fitness_cache is not None else 0
 
     @helper.print_method_run_time
     def run(self) -> list:
@@ -37,67 +98,347 @@ class GeneticAlgorithm(object):
         population = self.genetics.generate_initial_population()
         self.initial_population = population
         logger.debug('Start genetic algorithm.')
-        population = self._evolve(population)
+        self._start_stop_criteria()
+        with self.evaluator:
+            population = self._evolve(population)
         logger.debug('Stop genetic algorithm.')
         return population
 
     @helper.print_method_run_time
-    def _evolve(self, population) -> list:
+    def resume(self, path: str = None, restore_genetics: bool = True) -> list:
+        """
+        Resume computing for genetic algorithm from the checkpoint without evaluating saved generation again.
+
+        :param path: path to the checkpoint file (default: path of checkpointer).
+        :param restore_genetics: replace attributes of genetics with the saved ones, including attributes set
+                                 after construction of genetics. When False, genetics is used as it is
+                                 and only state of the algorithm and random generators is restored.
+
+        :return list: of most suitable solutions for the issue.
+
+        """
+        if path is None:
+            if self.checkpointer is None:
+                raise ValueError('Path to the checkpoint or checkpointer is required to resume genetic algorithm.')
+            path = self.checkpointer.path
+        logger.debug(f'Resuming genetic algorithm from {path}.')
+        population = self._restore_state(checkpoint.load_checkpoint(path), restore_genetics)
+        self._start_stop_criteria()
+        with self.evaluator:
+            population = self._evolve(population, evaluated=True)
+        logger.debug('Stop genetic algorithm.')
+        return population
+
+    def _get_state(self, population) -> dict:
+        """
+        Get state needed to resume genetic algorithm after evaluation of current generation.
+
+        :param population: current population with fitness values counted.
+
+        :return dict: state of genetic algorithm.
+        """
+        return {
+            'generation': self.generation,
+            'evaluations': self.evaluations,
+            'population': population,
+            'fitness_values': self.fitness_values,
+            'best_solution': self.best_solution,
+            'hall_of_fame': self.hall_of_fame,
+            'elites': self.elites,
+            'genetics_state': vars(self.genetics),
+            'random_state': random.getstate(),
+            'numpy_random_state': numpy.random.get_state(),
+        }
+
+    def _restore_state(self, state: dict, restore_genetics: bool = True):
+        """
+        Restore state of genetic algorithm saved by _get_state.
+
+        :param state: state of genetic algorithm.
+        :param restore_genetics: overwrite attributes of genetics with the saved ones.
+
+        :return list or ArrayPopulation: population with fitness values counted.
+        """
+        self.generation = state['generation']
+        self.evaluations = state['evaluations']
+        self.fitness_values = state['fitness_values']
+        self.fitness_and_chromosomes = list(zip(self.fitness_values, state['population']))
+        self.best_solution = state['best_solution']
+        self.hall_of_fame = state['hall_of_fame']
+        self.elites = state['elites']
+        if restore_genetics:
+            vars(self.genetics).update(state['genetics_state'])
+        random.setstate(state['random_state'])
+        numpy.random.set_state(state['numpy_random_state'])
+        logger.debug(f'Restored generation {self.generation} after {self.evaluations} evaluations.')
+        return state['population']
+
+    @helper.print_method_run_time
+    def _evolve(self, population, evaluated: bool = False) -> list:
         """
         Perform main loop of calculations for genetic algorithm
         and remember best solution overall till current generation.
 
+        :param population: first population of the loop.
+        :param evaluated: True if fitness values of the first population are already counted (resumed run).
+
         :return list: population with fitness value for each chromosome.
 
         """
         while True:
-            self._fulfill_list_of_chromosomes_with_their_fitness_value(population)
-            helper.print_best_five(self.fitness_and_chromosomes)
-            if self.genetics.check_stop_conditions(self.fitness_and_chromosomes):
+            generation_start = time.perf_counter()
+            counters_start = self._get_counters()
+            self.phase_times = dict.fromkeys(self.phase_times, 0.0)
+            if not evaluated:
+                population = self._fulfill_list_of_chromosomes_with_their_fitness_value(population)
+                self.phase_times['evaluation'] = time.perf_counter() - generation_start
+                self._remember_best(self.fitness_and_chromosomes)
+                self.generation += 1
+                if self.checkpointer is not None and self.checkpointer.is_due(self.generation):
+                    self.checkpointer.save(self._get_state(population))
+            evaluated = False
+            evaluated_population = population
+            stop = self._check_stop_criteria() or self.genetics.check_stop_conditions(self.fitness_and_chromosomes)
+            if not stop:
+                population = self._next_population(population)
+            if self.metrics_sink is not None:
+                self.metrics_sink.write(self._get_metrics(evaluated_population, generation_start, counters_start))
+            if stop:
                 logger.debug('Stop conditions pass.')
-                # helper.print_best_five(self.fitness_and_chromosomes)
+                helper.print_best_five(self.hall_of_fame.items())
                 break
-            self._remember_best(self.fitness_and_chromosomes)
-            population = self._generate_next_population(self.fitness_and_chromosomes)
         return population
 
+    def _start_stop_criteria(self) -> None:
+        """
+        Reset built-in stop criteria at the beginning of the run.
+        """
+        self.evaluation_stopped = False
+        if self.stop_criteria is not None:
+            self.stop_criteria.start()
+
+    def _check_stop_criteria(self) -> bool:
+        """
+        Check built-in stop criteria with running statistics after generation was evaluated.
+
+        :return bool: True if run should stop.
+        """
+        if self.evaluation_stopped:
+            logger.debug(f'Stop criteria {self.stop_criteria} met during evaluation.')
+            return True
+        if self.stop_criteria is None or self.best_solution is None:
+            return False
+        if self.stop_criteria.on_generation(self.generation, self.evaluations, self.best_solution[0]):
+            logger.debug(f'Stop criteria {self.stop_criteria} met.')
+            return True
+        return False
+
+    def _on_result(self, index: int, fitness_value) -> bool:
+        """
+        Count evaluation and check built-in stop criteria after one fitness value was counted.
+
+        :param index: index of chromosome in evaluated list.
+        :param fitness_value: fitness value just counted.
+
+        :return bool: True if evaluation of generation should stop.
+        """
+        self.evaluations += 1
+        if self.stop_criteria.on_evaluation(fitness_value, self.evaluations):
+            self.evaluation_stopped = True
+        return self.evaluation_stopped
+
+    def _get_counters(self) -> tuple:
+        """
+        Get counters used to count telemetry of one generation.
+
+        :return tuple: evaluations, cache hits, cache misses and busy time of evaluator.
+        """
+        return self.evaluations, self.cache_hits, self.cache_misses, self.evaluator.busy_time
+
+    def _get_metrics(self, population, generation_start: float, counters_start: tuple) -> dict:
+        """
+        Get telemetry of the generation.
+
+        :param population: evaluated population of the generation.
+        :param generation_start: time (time.perf_counter) when the generation started.
+        :param counters_start: counters (from _get_counters) when the generation started.
+
+        :return dict: telemetry record with keys from metrics.FIELDS.
+        """
+        evaluations, cache_hits, cache_misses, busy_time = (
+            end - start for end, start in zip(self._get_counters(), counters_start)
+        )
+        evaluation_time = self.phase_times['evaluation']
+        fitness_values = numpy.asarray(self.fitness_values, dtype=float)
+        if isinstance(population, array_population.ArrayPopulation):
+            distinct_chromosomes = len(numpy.unique(population.genes, axis=0))
+        else:
+            distinct_chromosomes = len(set(map(cache_module.FitnessCache.make_key, population)))
+
+        return {
+            'generation': self.generation,
+            'population_size': len(fitness_values),
+            'wall_time': time.perf_counter() - generation_start,
+            'evaluation_time': evaluation_time,
+            'selection_time': self.phase_times['selection'],
+            'crossover_time': self.phase_times['crossover'],
+            'mutation_time': self.phase_times['mutation'],
+            'evaluations': evaluations,
+            'evaluations_per_second': evaluations / evaluation_time if evaluation_time else None,
+            'cache_hit_rate': cache_hits / (cache_hits + cache_misses) if cache_hits + cache_misses else None,
+            'worker_utilization': (
+                busy_time / (evaluation_time * self.evaluator.number_of_workers) if evaluation_time else None
+            ),
+            'best_fitness': float(fitness_values.max()) if len(fitness_values) else None,
+            'mean_fitness': float(fitness_values.mean()) if len(fitness_values) else None,
+            'diversity': distinct_chromosomes / len(fitness_values) if len(fitness_values) else None,
+        }
+
+    def _next_population(self, population):
+        """
+        Generate next generation with operators matching the type of population.
+
+        Elites of current generation replace the first chromosomes of the new one and their fitness values
+        are remembered, so they are not evaluated again.
+
+        :param population: current population with fitness values counted.
+
+        :return list or ArrayPopulation: new population.
+        """
+        if isinstance(population, array_population.ArrayPopulation):
+            next_population = self._generate_next_array_population(population)
+            if self.elites:
+                next_population.genes[:len(self.elites)] = [chromosome for _, chromosome in self.elites]
+        else:
+            next_population = self._generate_next_population(self.fitness_and_chromosomes)
+            if self.elites:
+                elite_chromosomes = [chromosome for _, chromosome in self.elites]
+                next_population = elite_chromosomes + list(next_population[:len(next_population) - len(self.elites)])
+        self._carried_fitness_values = [fitness_value for fitness_value, _ in self.elites]
+        return next_population
+
     def _remember_best(self, fitness_and_chromosomes: list) -> None:
         """
-        Check if best chromosome from current population is the best over all by compering it with previous best one.
+        Remember the best chromosomes of current generation with partial selection instead of sorting.
+
+        Updates best solution overall, hall of fame and elites carried into the next generation.
 
         :param fitness_and_chromosomes: list of (fitness_value, chromosome)
         """
-        if self.best_solution:
-            if fitness_and_chromosomes.sort()[0][0] > self.best_solution[0]:
-                self.best_solution = fitness_and_chromosomes.sort()[0][0]
+        self.hall_of_fame.update(fitness_and_chromosomes)
+        self.best_solution = self.hall_of_fame.best
+        elite_size = min(self.elite_size, len(fitness_and_chromosomes) - 1)
+        self.elites = elitism.select_best(fitness_and_chromosomes, elite_size) if elite_size > 0 else list()
+        logger.debug(f"Best solution: {self.best_solution}")
 
     @helper.print_method_run_time
     def _fulfill_list_of_chromosomes_with_their_fitness_value(self, population):
         """
         Fulfilling list of pairs chromosomes with their fitness value.
 
+        When built-in stop criteria stopped evaluation, chromosomes which were not evaluated are dropped.
+
         :param population: list of chromosomes in population.
+
+        :return list or ArrayPopulation: evaluated population.
         """
-        self.fitness_and_chromosomes = list()
+        carried_fitness_values = self._carried_fitness_values
+        self._carried_fitness_values = list()
+        chromosomes = population
+        if carried_fitness_values:
+            chromosomes = self._skip_first_chromosomes(population, len(carried_fitness_values))
 
-        if self.genetics.number_of_threads < 2:
-            for index in range(len(population)):
-                logger.debug(f"Start calculations for chromosome number {index+1}.")
-                self.fitness_and_chromosomes.append((self.genetics.count_fitness(population[index]), population[index]))
+        logger.debug(f"Start calculations for {len(chromosomes)} chromosomes.")
+        if self.fitness_cache is None:
+            fitness_values = self._count_fitness_values(chromosomes)
         else:
-            last_max_range = 0
-            new_max_range = 0
-            step = self.genetics.number_of_threads
-            for _ in range(0, len(population), step):
-                with concurrent.futures.ThreadPoolExecutor(max_workers=self.genetics.number_of_threads) as executor:
-                    new_max_range = new_max_range + self.genetics.number_of_threads
-                    if new_max_range > len(population):
-                        new_max_range = len(population)
-                    for index in range(last_max_range, new_max_range):
-                        logger.debug(f"Start calculations for chromosome number {last_max_range + index + 1}.")
-                        result = executor.submit(self.genetics.count_fitness, population[index])
-                        self.fitness_and_chromosomes.append((result.result(), population[index]))
-                last_max_range = new_max_range
+            fitness_values = self._count_fitness_values_with_cache(chromosomes)
+        fitness_values = carried_fitness_values + list(fitness_values)
+        if self.evaluation_stopped:
+            evaluated = [fitness_value is not None for fitness_value in fitness_values]
+            population = self._select_chromosomes(population, evaluated)
+            fitness_values = [fitness_value for fitness_value in fitness_values if fitness_value is not None]
+            logger.debug(f"Evaluation stopped, {len(fitness_values)} chromosomes evaluated.")
+        self.fitness_values = fitness_values
+        self.fitness_and_chromosomes = list(zip(fitness_values, population))
+        return population
+
+    @staticmethod
+    def _skip_first_chromosomes(population, number: int):
+        """
+        Get population without its first chromosomes.
+
+        :param population: list (or array population) of chromosomes.
+        :param number: number of skipped chromosomes.
+
+        :return list or ArrayPopulation: the rest of population.
+        """
+        if isinstance(population, array_population.ArrayPopulation):
+            return population.like(population.genes[number:])
+        return population[number:]
+
+    @staticmethod
+    def _select_chromosomes(population, mask: list):
+        """
+        Get chromosomes of population selected by mask.
+
+        :param population: list (or array population) of chromosomes.
+        :param mask: flag for every chromosome if it is selected.
+
+        :return list or ArrayPopulation: selected chromosomes.
+        """
+        if isinstance(population, array_population.ArrayPopulation):
+            return population.like(population.genes[numpy.asarray(mask, dtype=bool)])
+        return [chromosome for chromosome, selected in zip(population, mask) if selected]
+
+    def _count_fitness_values(self, chromosomes) -> list:
+        """
+        Count fitness values with evaluator, vectorized when genetics implements count_fitness_batch
+        and with count_fitness_async when evaluator is asynchronous.
+
+        :param chromosomes: list (or array population) of chromosomes.
+
+        :return list: fitness values in the same order as chromosomes.
+        """
+        if self.batch_fitness:
+            self.evaluations += len(chromosomes)
+            return self.evaluator.evaluate_batch(self.genetics.count_fitness_batch, numpy.asarray(chromosomes)).tolist()
+
+        count_fitness = self.genetics.count_fitness_async if self.evaluator.asynchronous else self.genetics.count_fitness
+        if self.stop_criteria is None:
+            self.evaluations += len(chromosomes)
+            return self.evaluator.evaluate(count_fitness, chromosomes)
+        # evaluations are counted one by one, so criteria can stop generation during evaluation
+        return self.evaluator.evaluate(count_fitness, chromosomes, on_result=self._on_result)
+
+    def _count_fitness_values_with_cache(self, population) -> list:
+        """
+        Take fitness values from the cache and count only the ones of unique chromosomes missing in the cache.
+
+        :param population: list (or array population) of chromosomes.
+
+        :return list: fitness values in the same order as chromosomes in population.
+        """
+        keys = [cache_module.FitnessCache.make_key(chromosome) for chromosome in population]
+        known_fitness = {}
+        missing = {}
+        for index, key in enumerate(keys):
+            if key in known_fitness or key in missing:
+                continue
+            found, fitness_value = self.fitness_cache.get(key)
+            if found:
+                known_fitness[key] = fitness_value
+            else:
+                missing[key] = index
+
+        if missing:
+            logger.debug(f"Fitness cache: {len(known_fitness)} unique chromosomes found, {len(missing)} to count.")
+            missing_fitness = self._count_fitness_values([population[index] for index in missing.values()])
+            counted = [(key, value) for key, value in zip(missing, missing_fitness) if value is not None]
+            self.fitness_cache.put_many([key for key, _ in counted], [value for _, value in counted])
+            known_fitness.update(zip(missing, missing_fitness))
+
+        return [known_fitness[key] for key in keys]
 
     @helper.print_method_run_time
     def _generate_next_population(self, fitness_of_chromosomes: list) -> list:
@@ -112,12 +453,35 @@ class GeneticAlgorithm(object):
         parents_generator = self.genetics.choose_parents(fitness_of_chromosomes)
         size = len(fitness_of_chromosomes)
         next_generation = []
+        selection_time = crossover_time = mutation_time = 0.0
         logger.debug('Start generating next population.')
         while len(next_generation) < size:
+            phase_start = time.perf_counter()
             parents = next(parents_generator)
+            phase_end = time.perf_counter()
+            selection_time += phase_end - phase_start
             cross = random.random() < self.genetics.probability_crossover
             children = self.genetics.crossover(parents) if cross else parents
+            phase_start = time.perf_counter()
+            crossover_time += phase_start - phase_end
             for chromosome in children:
                 mutate = random.random() < self.genetics.probability_mutation
                 next_generation.append(self.genetics.mutate(chromosome) if mutate else chromosome)
+            mutation_time += time.perf_counter() - phase_start
+        self.phase_times.update(selection=selection_time, crossover=crossover_time, mutation=mutation_time)
         return next_generation[0:size]
+
+    @helper.print_method_run_time
+    def _generate_next_array_population(self, population: array_population.ArrayPopulation) \
+            -> array_population.ArrayPopulation:
+        """
+        Generating next generation of array population with vectorized operators of the population.
+
+        :param population: current population with fitness values counted.
+
+        :return ArrayPopulation: new population.
+
+        """
+        logger.debug('Start generating next array population.')
+        return population.next_generation(numpy.asarray(self.fitness_values), self.genetics.probability_crossover,
+                                          self.genetics.probability_mutation, self.phase_times)
@@ -0,0 +1,215 @@
+"""
+The module contains island model of genetic algorithm running independent populations in separate processes.
+
+Every island is a separate process evolving its own population with GeneticAlgorithm. Every migration_interval
+generations each island sends copies of its best chromosomes to its neighbours and replaces its worst chromosomes
+with the ones received. Island stops when its stop conditions pass or when any of its neighbours stopped,
+so stop spreads over all islands.
+Explanation:
+    Topologies:
+        ring - island number i sends migrants to island number i + 1 (the last one to the first one).
+        fully_connected - every island sends migrants to all other islands.
+
+Example:
+    >>>from gom.genetic_logic import island_model
+    >>>islands = island_model.IslandModel(genetics, number_of_islands=8, migration_interval=10, migration_size=2)
+    >>>best_fitness, best_chromosome = islands.run()
+
+"""
+import heapq
+import multiprocessing
+import random
+
+import numpy
+from loguru import logger
+
+import gom.genetic_logic.functions_interface as genetic_interface
+from gom.genetic_logic import array_population
+from gom.genetic_logic import evaluators
+from gom.genetic_logic import genetic_algorithm
+from gom.genetic_logic import helper_functions as helper
+
+TOPOLOGIES = ('ring', 'fully_connected')
+
+
+def get_neighbours(island_index: int, number_of_islands: int, topology: str) -> list:
+    """
+    Get indexes of islands receiving migrants from the island.
+
+    :param island_index: index of the sending island.
+    :param number_of_islands: number of all islands.
+    :param topology: one of TOPOLOGIES.
+
+    :return list: indexes of receiving islands.
+    """
+    if number_of_islands < 2:
+        return []
+    if topology == 'ring':
+        return [(island_index + 1) % number_of_islands]
+    return [index for index in range(number_of_islands) if index != island_index]
+
+
+def _replace_worst(algorithm: genetic_algorithm.GeneticAlgorithm, population, immigrants: list) -> None:
+    """
+    Replace the worst chromosomes of evaluated population with immigrants.
+
+    :param algorithm: genetic algorithm of the island with fitness values of current population.
+    :param population: current population of the island.
+    :param immigrants: list of (fitness_value, chromosome) received from neighbours.
+    """
+    fitness_values = list(algorithm.fitness_values)
+    worst = heapq.nsmallest(len(immigrants), range(len(fitness_values)), key=fitness_values.__getitem__)
+    for index, (fitness_value, chromosome) in zip(worst, immigrants):
+        fitness_values[index] = fitness_value
+        algorithm.fitness_and_chromosomes[index] = (fitness_value, chromosome)
+        if isinstance(population, array_population.ArrayPopulation):
+            population.genes[index] = chromosome
+    algorithm.fitness_values = fitness_values
+
+
+def _run_island(island_index: int, genetics, inboxes: list, outboxes: list, results, migration_interval: int,
+                migration_size: int, seed: int) -> None:
+    """
+    Evolve population of one island and exchange migrants with neighbours. Runs in separate process.
+
+    :param island_index: index of the island.
+    :param genetics: implementation of interface GeneticFunctions or function creating it from island index.
+    :param inboxes: queues with migrants from each neighbour sending to this island.
+    :param outboxes: queues with migrants to each neighbour receiving from this island.
+    :param results: queue for (island_index, best_solution, generations, error).
+    :param migration_interval: number of generations between migrations.
+    :param migration_size: number of best chromosomes sent to each neighbour.
+    :param seed: seed for random generators of the island.
+    """
+    best_solution = None
+    generation = 0
+    try:
+        if seed is not None:
+            random.seed(seed + island_index)
+            numpy.random.seed(seed + island_index)
+        if not isinstance(genetics, genetic_interface.GeneticFunctionsInterface):
+            genetics = genetics(island_index)
+
+        algorithm = genetic_algorithm.GeneticAlgorithm(genetics, evaluator=evaluators.SerialEvaluator())
+        population = genetics.generate_initial_population()
+        while True:
+            algorithm._fulfill_list_of_chromosomes_with_their_fitness_value(population)
+            generation += 1
+            island_best = max(algorithm.fitness_and_chromosomes, key=lambda pair: pair[0])
+            if best_solution is None or island_best[0] > best_solution[0]:
+                best_solution = island_best
+
+            stop = genetics.check_stop_conditions(algorithm.fitness_and_chromosomes)
+            if stop or generation % migration_interval == 0:
+                emigrants = heapq.nlargest(migration_size, algorithm.fitness_and_chromosomes, key=lambda pair: pair[0])
+                for outbox in outboxes:
+                    outbox.put((stop, emigrants))
+                if stop:
+                    logger.debug(f"Island {island_index}: stop conditions pass in generation {generation}.")
+                    break
+
+                immigrants = []
+                for inbox in inboxes:
+                    neighbour_stopped, migrants = inbox.get()
+                    stop = stop or neighbour_stopped
+                    immigrants.extend(migrants)
+                if stop:
+                    logger.debug(f"Island {island_index}: neighbour stopped in generation {generation}.")
+                    # neighbours wait for one message per migration, so stop has to be passed further
+                    for outbox in outboxes:
+                        outbox.put((True, []))
+                    break
+                _replace_worst(algorithm, population, immigrants)
+
+            population = algorithm._next_population(population)
+        results.put((island_index, best_solution, generation, None))
+    except Exception as e:
+        logger.error(f"Island {island_index} failed: {e}")
+        for outbox in outboxes:
+            outbox.put((True, []))
+        results.put((island_index, best_solution, generation, repr(e)))
+
+
+class IslandModel(object):
+    """Run many populations of genetic algorithm in separate processes with migration between them."""
+
+    def __init__(self, genetics, number_of_islands: int = None, migration_interval: int = 10,
+                 migration_size: int = 1, topology: str = 'ring', seed: int = None, start_method: str = None):
+        """
+        Construct object of IslandModel.
+
+        :param genetics: implementation of interface GeneticFunctions (copied to every island) or picklable
+                         function creating it from island index.
+        :param number_of_islands: number of islands and processes (default: number of CPUs).
+        :param migration_interval: number of generations between migrations.
+        :param migration_size: number of best chromosomes sent to each neighbour.
+        :param topology: one of TOPOLOGIES.
+        :param seed: base seed for random generators, island number i uses seed + i (default: not seeded).
+        :param start_method: multiprocessing start method (default: platform default).
+
+        :raise ValueError: Raise exception if topology is unknown.
+
+        :return IslandModel: instance of class IslandModel.
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f'Unknown topology "{topology}". Use one of {TOPOLOGIES}.')
+        self.genetics = genetics
+        self.number_of_islands = number_of_islands or multiprocessing.cpu_count()
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.seed = seed
+        self.start_method = start_method
+        self.island_results = list()
+        self.best_solution = None
+
+    @helper.print_method_run_time
+    def run(self) -> tuple:
+        """
+        Run all islands and wait until every island stops.
+
+        :raise RuntimeError: Raise exception if any of islands failed.
+
+        :return tuple: global best (fitness_value, chromosome) over all islands.
+        """
+        context = multiprocessing.get_context(self.start_method)
+        with context.Manager() as manager:
+            # one queue per directed connection keeps migrants of each migration in order
+            connections = {
+                (sender, receiver): manager.Queue()
+                for sender in range(self.number_of_islands)
+                for receiver in get_neighbours(sender, self.number_of_islands, self.topology)
+            }
+            results = manager.Queue()
+
+            logger.debug(f"Starting {self.number_of_islands} islands with {self.topology} topology.")
+            processes = []
+            for island_index in range(self.number_of_islands):
+                process = context.Process(
+                    target=_run_island,
+                    args=(
+                        island_index,
+                        self.genetics,
+                        [queue for (_, receiver), queue in connections.items() if receiver == island_index],
+                        [queue for (sender, _), queue in connections.items() if sender == island_index],
+                        results,
+                        self.migration_interval,
+                        self.migration_size,
+                        self.seed
+                    )
+                )
+                process.start()
+                processes.append(process)
+
+            self.island_results = sorted(results.get() for _ in processes)
+            for process in processes:
+                process.join()
+
+        errors = [(index, error) for index, _, _, error in self.island_results if error is not None]
+        if errors:
+            raise RuntimeError(f'Islands failed: {errors}')
+
+        island_bests = [best for _, best, _, _ in self.island_results if best is not None]
+        self.best_solution = max(island_bests, key=lambda pair: pair[0])
+        logger.debug(f"Best solution over all islands: {self.best_solution}")
+        return self.best_solution
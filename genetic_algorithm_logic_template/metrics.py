@@ -0,0 +1,138 @@
+"""
+Module contains telemetry of genetic algorithm and sinks the telemetry is written to.
+
+Genetic algorithm writes one record (dictionary with keys from FIELDS) per generation.
+Explanation:
+    wall_time - time of whole generation (evaluation, bookkeeping and breeding) in seconds.
+    evaluation_time, selection_time, crossover_time, mutation_time - time of each phase in seconds.
+    evaluations - number of fitness values counted (without cache hits and carried elites).
+    evaluations_per_second - evaluations divided by evaluation_time.
+    cache_hit_rate - part of cache lookups in generation answered from cache (None without cache).
+    worker_utilization - busy time of workers divided by evaluation_time and number of workers.
+    best_fitness, mean_fitness - statistics of fitness values in generation.
+    diversity - number of distinct chromosomes divided by size of population.
+
+Example:
+    >>>from gom.genetic_logic import metrics
+    >>>sink = metrics.InMemorySink()
+    >>>algorithm = GeneticAlgorithm(genetics, metrics_sink=sink)
+    >>>algorithm.run()
+    >>>print(sink.records[-1]['evaluations_per_second'])
+
+"""
+import abc
+import csv
+import json
+
+FIELDS = (
+    'generation',
+    'population_size',
+    'wall_time',
+    'evaluation_time',
+    'selection_time',
+    'crossover_time',
+    'mutation_time',
+    'evaluations',
+    'evaluations_per_second',
+    'cache_hit_rate',
+    'worker_utilization',
+    'best_fitness',
+    'mean_fitness',
+    'diversity',
+)
+
+
+class MetricsSinkInterface(abc.ABC):
+    """Interface for all destinations of genetic algorithm telemetry."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @abc.abstractmethod
+    def write(self, record: dict) -> None:
+        """
+        Write telemetry of one generation.
+
+        :param record: dictionary with keys from FIELDS.
+        """
+
+    def close(self) -> None:
+        """
+        Release resources used by sink.
+        """
+
+
+class InMemorySink(MetricsSinkInterface):
+    """Keep telemetry records in list."""
+
+    def __init__(self):
+        self.records = list()
+
+    def write(self, record: dict) -> None:
+        """
+        Write telemetry of one generation.
+
+        :param record: dictionary with keys from FIELDS.
+        """
+        self.records.append(record)
+
+
+class CsvSink(MetricsSinkInterface):
+    """Write telemetry records as rows of csv file."""
+
+    def __init__(self, path: str):
+        """
+        Construct object of CsvSink.
+
+        :param path: path to the csv file (overwritten).
+        """
+        self.path = path
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=FIELDS)
+        self._writer.writeheader()
+
+    def write(self, record: dict) -> None:
+        """
+        Write telemetry of one generation.
+
+        :param record: dictionary with keys from FIELDS.
+        """
+        self._writer.writerow(record)
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Close csv file.
+        """
+        self._file.close()
+
+
+class JsonLinesSink(MetricsSinkInterface):
+    """Write telemetry records as lines of JSON file."""
+
+    def __init__(self, path: str):
+        """
+        Construct object of JsonLinesSink.
+
+        :param path: path to the JSON lines file (appended).
+        """
+        self.path = path
+        self._file = open(path, 'a')
+
+    def write(self, record: dict) -> None:
+        """
+        Write telemetry of one generation.
+
+        :param record: dictionary with keys from FIELDS.
+        """
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Close JSON lines file.
+        """
+        self._file.close()
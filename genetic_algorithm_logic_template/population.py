@@ -18,9 +18,15 @@ Example:
     >>> 'param3': [1, 3, 1, 1],  # we have three possible geometries, step is 1 to not "jump over" of any of them
     >>> 'param4': [1, 2, 1, 1]}  # we have two possible materials, step is 1 to not "jump over" of any of them
 
+For big configurations use SearchSpace, which does not materialize the population. It gives the number of
+chromosomes, chromosome with given rank (position in the order of itertools.product) and random sample of
+distinct chromosomes in constant memory.
+
 """
 
 import itertools
+import random
+import sys
 import time
 
 from loguru import logger
@@ -44,24 +50,9 @@ def generate_population(configuration: dict) -> list:
         >>># Population has been created and stored in dummy_population variable!
 
     """
-    validate_configuration_dictionary(configuration)
-
     algorithm_start = time.perf_counter()
-    population = []
-    parameter_variation = []
-
     logger.debug('Creating population.')
-    for key in configuration:
-        parameter_min = configuration[key][0]
-        parameter_max = configuration[key][1]
-        parameter_step = configuration[key][2]
-        for element in range(parameter_min, parameter_max, parameter_step):
-            parameter_variation.append(element)
-        population.append(parameter_variation)
-        parameter_variation = []
-
-    population = list(itertools.product(*population))
-    [logger.debug(elem) for elem in population]
+    population = list(SearchSpace(configuration))
     algorithm_end = time.perf_counter()
     logger.debug(f'Size of population: {len(population)}')
     logger.debug("Time of generating population: {0:02f}s".format(algorithm_end - algorithm_start))
@@ -69,6 +60,105 @@ def generate_population(configuration: dict) -> list:
     return population
 
 
+class SearchSpace(object):
+    """Lazy search space of all chromosomes defined by the configuration dictionary."""
+
+    def __init__(self, configuration: dict):
+        """
+        Construct object of SearchSpace.
+
+        :param configuration: Dictionary with configuration consist with the name of the parameter as a key and
+                    list of bottom for range, top for range and step as value.
+
+        :return SearchSpace: instance of class SearchSpace.
+
+        Example:
+            >>>from gom.genetic_logic import population
+            >>>search_space = population.SearchSpace({"Parameter": [0, 10, 2, 1], "Other": [0, 100, 1, 5]})
+            >>>len(search_space)  # 500
+            >>>search_space[7]  # (0, 7)
+            >>>search_space.sample(10, seed=42)  # ten distinct random chromosomes
+
+        """
+        validate_configuration_dictionary(configuration)
+        self.names = list(configuration)
+        self.ranges = [range(*configuration[key][:3]) for key in configuration]
+        self.size = 1
+        for parameter_range in self.ranges:
+            self.size *= len(parameter_range)
+        logger.debug(f'Size of search space: {self.size}')
+
+    def __len__(self) -> int:
+        """
+        Number of chromosomes in search space (use size attribute for spaces bigger than sys.maxsize).
+        """
+        return self.size
+
+    def __iter__(self):
+        """
+        Iterate over chromosomes lazily in the same order as generate_population.
+        """
+        return itertools.product(*self.ranges)
+
+    def __getitem__(self, rank: int) -> tuple:
+        """
+        Get chromosome with given rank by decoding rank as mixed-radix number (last parameter changes fastest).
+
+        :param rank: position of chromosome in search space.
+
+        :raise IndexError: Raise exception if rank is out of search space.
+
+        :return tuple: chromosome.
+        """
+        if rank < 0:
+            rank += self.size
+        if not 0 <= rank < self.size:
+            raise IndexError(f'Rank {rank} out of search space of size {self.size}.')
+
+        chromosome = []
+        for parameter_range in reversed(self.ranges):
+            rank, index = divmod(rank, len(parameter_range))
+            chromosome.append(parameter_range[index])
+        return tuple(reversed(chromosome))
+
+    def rank(self, chromosome) -> int:
+        """
+        Get rank of chromosome (inverse of indexing).
+
+        :param chromosome: one individual from the search space.
+
+        :raise ValueError: Raise exception if chromosome is not in search space.
+
+        :return int: position of chromosome in search space.
+        """
+        rank = 0
+        for parameter_range, value in zip(self.ranges, chromosome):
+            rank = rank * len(parameter_range) + parameter_range.index(value)
+        return rank
+
+    def sample(self, k: int, seed: int = None) -> list:
+        """
+        Draw k distinct chromosomes uniformly at random without enumerating search space.
+
+        :param k: number of chromosomes to draw.
+        :param seed: seed for random generator.
+
+        :raise ValueError: Raise exception if k is bigger than search space.
+
+        :return list: distinct chromosomes as tuples.
+        """
+        if k > self.size:
+            raise ValueError(f'Sample of {k} is larger than search space of size {self.size}.')
+        generator = random.Random(seed)
+        if self.size <= sys.maxsize:
+            ranks = generator.sample(range(self.size), k)
+        else:
+            ranks = dict()
+            while len(ranks) < k:
+                ranks[generator.randrange(self.size)] = None
+        return [self[rank] for rank in ranks]
+
+
 def validate_configuration_dictionary(configuration: dict) -> None:
     """
     Validate the configuration file and raise an exception when is invalid.
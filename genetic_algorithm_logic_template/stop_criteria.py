@@ -0,0 +1,189 @@
+"""
+Module contains built-in stop criteria of genetic algorithm.
+
+Criteria are updated incrementally from running statistics (number of generations, number of evaluations and
+the best fitness value so far), so they never scan the population. Criteria which can be decided from a single
+fitness value or counter (target fitness, wall clock budget, evaluation budget) also stop generation during
+its evaluation, so chromosomes left in the generation are not evaluated.
+Criteria may be combined with | operator, run stops when any of them is met.
+Explanation:
+    Stagnation - the best fitness value did not improve by more than min_delta for given number of generations.
+    TargetFitness - fitness value reached the target.
+    WallClockBudget - run takes given number of seconds.
+    EvaluationBudget - given number of fitness values were counted.
+
+Example:
+    >>>from gom.genetic_logic import stop_criteria
+    >>>criteria = stop_criteria.TargetFitness(100) | stop_criteria.Stagnation(20) | stop_criteria.WallClockBudget(3600)
+    >>>algorithm = GeneticAlgorithm(genetics, stop_criteria=criteria)
+
+"""
+import abc
+import time
+
+
+class StopCriterionInterface(abc.ABC):
+    """Interface for all built-in stop criteria of genetic algorithm."""
+
+    def __or__(self, other: 'StopCriterionInterface') -> 'AnyOf':
+        return AnyOf(self, other)
+
+    def start(self) -> None:
+        """
+        Reset state of criterion at the beginning of the run.
+        """
+
+    def on_evaluation(self, fitness_value, evaluations: int) -> bool:
+        """
+        Check criterion after one fitness value was counted.
+
+        :param fitness_value: fitness value just counted.
+        :param evaluations: number of fitness values counted in the run so far.
+
+        :return bool: True if run should stop without evaluating the rest of generation.
+        """
+        return False
+
+    @abc.abstractmethod
+    def on_generation(self, generation: int, evaluations: int, best_fitness) -> bool:
+        """
+        Check criterion after generation was evaluated.
+
+        :param generation: number of evaluated generations.
+        :param evaluations: number of fitness values counted in the run so far.
+        :param best_fitness: the best fitness value in the run so far.
+
+        :return bool: True if run should stop.
+        """
+
+
+class AnyOf(StopCriterionInterface):
+    """Stop when any of criteria is met."""
+
+    def __init__(self, *criteria: StopCriterionInterface):
+        self.criteria = []
+        for criterion in criteria:
+            self.criteria.extend(criterion.criteria if isinstance(criterion, AnyOf) else [criterion])
+        self.met_criterion = None
+
+    def __repr__(self) -> str:
+        return ' | '.join(repr(criterion) for criterion in self.criteria)
+
+    def start(self) -> None:
+        self.met_criterion = None
+        for criterion in self.criteria:
+            criterion.start()
+
+    def on_evaluation(self, fitness_value, evaluations: int) -> bool:
+        for criterion in self.criteria:
+            if criterion.on_evaluation(fitness_value, evaluations):
+                self.met_criterion = criterion
+                return True
+        return False
+
+    def on_generation(self, generation: int, evaluations: int, best_fitness) -> bool:
+        met = False
+        # every criterion is updated, so stateful criteria (e.g. Stagnation) see every generation
+        for criterion in self.criteria:
+            if criterion.on_generation(generation, evaluations, best_fitness) and not met:
+                self.met_criterion = criterion
+                met = True
+        return met
+
+
+class Stagnation(StopCriterionInterface):
+    """Stop when the best fitness value did not improve for given number of generations."""
+
+    def __init__(self, generations: int, min_delta: float = 0.0):
+        """
+        Construct object of Stagnation.
+
+        :param generations: number of generations without improvement.
+        :param min_delta: minimal change of the best fitness value counted as improvement.
+        """
+        self.generations = generations
+        self.min_delta = min_delta
+        self._best_fitness = None
+        self._generations_without_improvement = 0
+
+    def __repr__(self) -> str:
+        return f'Stagnation(generations={self.generations}, min_delta={self.min_delta})'
+
+    def start(self) -> None:
+        self._best_fitness = None
+        self._generations_without_improvement = 0
+
+    def on_generation(self, generation: int, evaluations: int, best_fitness) -> bool:
+        if self._best_fitness is None or best_fitness > self._best_fitness + self.min_delta:
+            self._best_fitness = best_fitness
+            self._generations_without_improvement = 0
+        else:
+            self._generations_without_improvement += 1
+        return self._generations_without_improvement >= self.generations
+
+
+class TargetFitness(StopCriterionInterface):
+    """Stop as soon as any chromosome reaches target fitness value."""
+
+    def __init__(self, target):
+        """
+        Construct object of TargetFitness.
+
+        :param target: fitness value which is good enough.
+        """
+        self.target = target
+
+    def __repr__(self) -> str:
+        return f'TargetFitness(target={self.target})'
+
+    def on_evaluation(self, fitness_value, evaluations: int) -> bool:
+        return fitness_value >= self.target
+
+    def on_generation(self, generation: int, evaluations: int, best_fitness) -> bool:
+        return best_fitness is not None and best_fitness >= self.target
+
+
+class WallClockBudget(StopCriterionInterface):
+    """Stop when run takes given number of seconds."""
+
+    def __init__(self, seconds: float):
+        """
+        Construct object of WallClockBudget.
+
+        :param seconds: time budget of the run in seconds (counted from start or resume of the run).
+        """
+        self.seconds = seconds
+        self._deadline = None
+
+    def __repr__(self) -> str:
+        return f'WallClockBudget(seconds={self.seconds})'
+
+    def start(self) -> None:
+        self._deadline = time.monotonic() + self.seconds
+
+    def on_evaluation(self, fitness_value, evaluations: int) -> bool:
+        return time.monotonic() >= self._deadline
+
+    def on_generation(self, generation: int, evaluations: int, best_fitness) -> bool:
+        return time.monotonic() >= self._deadline
+
+
+class EvaluationBudget(StopCriterionInterface):
+    """Stop when given number of fitness values were counted."""
+
+    def __init__(self, max_evaluations: int):
+        """
+        Construct object of EvaluationBudget.
+
+        :param max_evaluations: maximal number of fitness values counted in the run.
+        """
+        self.max_evaluations = max_evaluations
+
+    def __repr__(self) -> str:
+        return f'EvaluationBudget(max_evaluations={self.max_evaluations})'
+
+    def on_evaluation(self, fitness_value, evaluations: int) -> bool:
+        return evaluations >= self.max_evaluations
+
+    def on_generation(self, generation: int, evaluations: int, best_fitness) -> bool:
+        return evaluations >= self.max_evaluations
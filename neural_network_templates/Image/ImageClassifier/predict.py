@@ -3,9 +3,13 @@ import torch
 
 # Imports functions created for this program
 from predict_utils.get_input_args import get_input_args
+from predict_utils.image_dataset import get_image_loader
+from predict_utils.image_dataset import get_image_paths
 from predict_utils.load_checkpoint import load_checkpoint
 from predict_utils.process_image import process_image
 from predict_utils.print_results import print_results
+from predict_utils.write_results import get_class_names
+from predict_utils.write_results import write_results
 
 
 # Predict the class from an image file
@@ -22,6 +26,31 @@ def predict(image, model, gpu, top_k=5):
     return top_p[0], top_class[0]
 
 
+# Predict the classes of many images loaded in batches
+def predict_batch(paths, loader, model, gpu, top_k=5):
+    ''' Predict top k classes of images from loader, yields (paths, top_p, top_class, errors) for every batch,
+        errors are (path, message) pairs of images which could not be read.
+    '''
+    if gpu:
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    else:
+        device = "cpu"
+    model.to(device)
+    # Turn on model evaluation mode to turn off dropout
+    model.eval()
+
+    with torch.inference_mode():
+        for images, indices, errors in loader:
+            errors = [(paths[index], error) for index, error in errors]
+            if images is None:
+                # No image of batch could be read
+                yield [], torch.empty(0, top_k), torch.empty(0, top_k, dtype=torch.int64), errors
+                continue
+            images = images.to(device, non_blocking=True)
+            top_p, top_class = torch.exp(model(images)).topk(top_k, dim=1)
+            yield [paths[index] for index in indices.tolist()], top_p.cpu(), top_class.cpu(), errors
+
+
 # Main program function defined below
 def main():
     # Get command line arguments
@@ -30,8 +59,23 @@ def main():
     # Check command line arguments
     # TODO: Nice to have: check_command_line_arguments(in_arg)
     
+    if in_arg.threads:
+        torch.set_num_threads(in_arg.threads)
+
     # Load model from checkpoint
     model = load_checkpoint(in_arg.checkpoint)
+
+    if in_arg.output:
+        # Predict all images in batches and stream results to the file
+        paths = get_image_paths(in_arg.img_dir)
+        loader = get_image_loader(paths, in_arg.batch_size, in_arg.num_workers, in_arg.gpu)
+        results = predict_batch(paths, loader, model, in_arg.gpu, in_arg.top_k)
+        written, failed = write_results(results, in_arg.output, get_class_names(model, in_arg.category_names),
+                                        in_arg.top_k)
+        print(f"Predictions of {written} images saved to {in_arg.output}")
+        if failed:
+            print(f"{failed} images could not be read, see rows with error in {in_arg.output}")
+        return
     
     # Process image
     image = process_image(in_arg.img_dir)
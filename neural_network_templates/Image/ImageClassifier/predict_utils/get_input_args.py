@@ -8,7 +8,8 @@ def get_input_args() -> argparse.Namespace:
 
     # Argument 1: a path to a image
     parser.add_argument('img_dir', type=str, # default='flowers/train/1/image_06734.jpg',
-                        help='Path to the image.')
+                        help='Path to the image. With --output also a directory, a glob pattern '
+                             'or a .txt file with one image path per line.')
 
     # Argument 2: a path to a CNN Model Architecture checkpoint
     parser.add_argument('checkpoint', type=str, # default='checkpoint.pth',
@@ -26,4 +27,21 @@ def get_input_args() -> argparse.Namespace:
     parser.add_argument('--gpu', action='store_true', default=False,
                         help='Flag for turning on GPU computing.')
 
+    # Argument 6: a path to a file with results of batch prediction
+    parser.add_argument('--output', type=str, default=None,
+                        help='Path to .jsonl or .csv file. When passed, all images from img_dir are predicted '
+                             'in batches and results are written to the file.')
+
+    # Argument 7: a number of images in batch
+    parser.add_argument('--batch_size', type=int, default=64,
+                        help='Number of images predicted in one forward pass (batch prediction).')
+
+    # Argument 8: a number of processes loading images
+    parser.add_argument('--num_workers', type=int, default=4,
+                        help='Number of DataLoader workers decoding images (batch prediction).')
+
+    # Argument 9: a number of CPU threads
+    parser.add_argument('--threads', type=int, default=None,
+                        help='Number of CPU threads used by PyTorch (default: PyTorch default).')
+
     return parser.parse_args()
@@ -0,0 +1,45 @@
+# Imports python modules
+import argparse
+
+
+def get_server_args() -> argparse.Namespace:
+    # Creates Argument Parser object named parser
+    parser = argparse.ArgumentParser()
+
+    # Argument 1: a path to a CNN Model Architecture checkpoint
+    parser.add_argument('checkpoint', type=str,
+                        help='Path to a CNN Model Architecture checkpoint.')
+
+    # Argument 2: a host of the server
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                        help='Host the server listens on.')
+
+    # Argument 3: a port of the server
+    parser.add_argument('--port', type=int, default=8080,
+                        help='Port the server listens on.')
+
+    # Argument 4: a maximal number of images in one forward pass
+    parser.add_argument('--max_batch_size', type=int, default=32,
+                        help='Maximal number of images predicted in one forward pass.')
+
+    # Argument 5: a maximal time of waiting for batch
+    parser.add_argument('--max_wait_ms', type=float, default=5.0,
+                        help='Maximal time in milliseconds a request waits for other requests to fill the batch.')
+
+    # Argument 6: a number of CPU threads
+    parser.add_argument('--threads', type=int, default=None,
+                        help='Number of CPU threads used by PyTorch (default: PyTorch default).')
+
+    # Argument 7: a value of K
+    parser.add_argument('--top_k', type=int, default=1,
+                        help='Default number of top classes returned, can be changed with top_k query parameter.')
+
+    # Argument 8: a path to category names file
+    parser.add_argument('--category_names', type=str, default='cat_to_name.json',
+                        help='Path to category names file.')
+
+    # Argument 9: a flag for turning on GPU
+    parser.add_argument('--gpu', action='store_true', default=False,
+                        help='Flag for turning on GPU computing.')
+
+    return parser.parse_args()
@@ -0,0 +1,72 @@
+# Imports python modules
+import glob
+import os
+
+import torch
+from PIL import Image
+from PIL import UnidentifiedImageError
+
+# Imports functions created for this program
+from predict_utils.process_image import get_image_transform
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tif', '.tiff', '.webp')
+
+
+def get_image_paths(source: str) -> list:
+    ''' Get paths of images from a directory (searched recursively), a glob pattern,
+        a text file with one path per line or a single image file.
+    '''
+    if os.path.isdir(source):
+        return sorted(os.path.join(root, name)
+                      for root, _, names in os.walk(source)
+                      for name in names if name.lower().endswith(IMAGE_EXTENSIONS))
+    if source.endswith('.txt'):
+        with open(source, 'r') as f:
+            return [line.strip() for line in f if line.strip()]
+    if os.path.isfile(source):
+        return [source]
+
+    return sorted(glob.glob(source, recursive=True))
+
+
+class ImageFiles(torch.utils.data.Dataset):
+    ''' Dataset of image files processed the same way as process_image, so DataLoader workers decode
+        and transform images in parallel. Unreadable file gives None image and error message instead of
+        stopping the whole run.
+    '''
+    def __init__(self, paths: list):
+        self.paths = paths
+        self.transform = get_image_transform()
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, index: int):
+        try:
+            # Convert to RGB, so grayscale and RGBA images can be stacked in one batch
+            with Image.open(self.paths[index]) as image:
+                return self.transform(image.convert('RGB')), index, None
+        except (OSError, UnidentifiedImageError) as error:
+            return None, index, str(error)
+
+
+def collate_images(batch: list):
+    ''' Stack readable images of batch, returns (images, indices, errors) where errors are (index, message)
+        pairs of unreadable images. Images are None when no image of batch is readable.
+    '''
+    readable = [(image, index) for image, index, _ in batch if image is not None]
+    errors = [(index, error) for image, index, error in batch if image is None]
+    if not readable:
+        return None, torch.empty(0, dtype=torch.int64), errors
+    images, indices = torch.utils.data.default_collate(readable)
+
+    return images, indices, errors
+
+
+def get_image_loader(paths: list, batch_size: int, num_workers: int, gpu: bool = False) -> torch.utils.data.DataLoader:
+    return torch.utils.data.DataLoader(ImageFiles(paths),
+                                       batch_size=batch_size,
+                                       shuffle=False,
+                                       collate_fn=collate_images,
+                                       num_workers=num_workers,
+                                       pin_memory=gpu and torch.cuda.is_available())
@@ -3,15 +3,15 @@ import torch
 from torchvision import models
 
 
-def get_arch(arch: str):
+def get_arch(arch: str, pretrained: bool = True):
     if arch == 'resnet18':
-        model = models.resnet18(pretrained=True)
+        model = models.resnet18(pretrained=pretrained)
     if arch == 'alexnet':
-        model = models.alexnet(pretrained=True)
+        model = models.alexnet(pretrained=pretrained)
     if arch == 'vgg13':
-        model = models.vgg13(pretrained=True)
+        model = models.vgg13(pretrained=pretrained)
     if arch == 'vgg16':    
-        model = models.vgg16(pretrained=True)
+        model = models.vgg16(pretrained=pretrained)
     
     return model
         
@@ -27,8 +27,8 @@ def load_checkpoint(filepath: str):
     # Load checkpoint dict
     checkpoint = torch.load(filepath, map_location=map_location)
     
-    # Load model
-    model = get_arch(checkpoint['arch'])
+    # Load model, weights come from checkpoint so pretrained weights are not downloaded
+    model = get_arch(checkpoint['arch'], pretrained=False)
         
     for param in model.parameters():
         param.requires_grad = False
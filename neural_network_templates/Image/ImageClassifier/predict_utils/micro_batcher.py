@@ -0,0 +1,88 @@
+# Imports python modules
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import torch
+
+
+class MicroBatcher:
+    ''' Collect images from concurrent requests into batches and run one forward pass per batch.
+
+        Batch is run when it has max_batch_size images or when the oldest image waits max_wait seconds,
+        so latency of a request is bounded by max_wait plus time of one forward pass.
+    '''
+    def __init__(self, model, device, max_batch_size: int = 32, max_wait: float = 0.005):
+        self.model = model
+        self.device = device
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self.batches = 0
+        self.images = 0
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+
+    def start(self):
+        self.model.to(self.device)
+        # Turn on model evaluation mode to turn off dropout
+        self.model.eval()
+        self._thread.start()
+
+    def stop(self):
+        self.requests.put(None)
+        self._thread.join()
+
+    def submit(self, image: torch.Tensor, top_k: int) -> Future:
+        ''' Queue processed image (tensor 3 x 224 x 224), future is resolved with (top_p, top_class).'''
+        if top_k < 1:
+            raise ValueError(f'top_k must be positive, got {top_k}')
+        future = Future()
+        self.requests.put((image, top_k, future))
+        return future
+
+    def _collect(self) -> list:
+        # Wait for the first request without limit, then only until the first request waits max_wait
+        first = self.requests.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                # Put stop signal back, so loop stops after this batch
+                self.requests.put(None)
+                break
+            batch.append(request)
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            try:
+                images = torch.stack([image for image, _, _ in batch]).to(self.device)
+                with torch.inference_mode():
+                    probabilities = torch.exp(self.model(images))
+                    # Cap top_k by number of classes, so one request with too large top_k does not fail the batch
+                    max_top_k = min(max(top_k for _, top_k, _ in batch), probabilities.shape[1])
+                    top_p, top_class = probabilities.topk(max_top_k, dim=1)
+                top_p, top_class = top_p.cpu(), top_class.cpu()
+            except Exception as error:
+                for _, _, future in batch:
+                    future.set_exception(error)
+                continue
+
+            self.batches += 1
+            self.images += len(batch)
+            for index, (_, top_k, future) in enumerate(batch):
+                future.set_result((top_p[index, :top_k], top_class[index, :top_k]))
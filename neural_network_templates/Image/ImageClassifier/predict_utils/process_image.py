@@ -3,6 +3,15 @@ import numpy as np
 from PIL import Image
 from torchvision import transforms
 
+def get_image_transform() -> transforms.Compose:
+    return transforms.Compose([transforms.Resize(255),
+                               transforms.CenterCrop(224),
+                               transforms.ToTensor(),
+                               transforms.Normalize(
+                                   [0.485, 0.456, 0.406],
+                                   [0.229, 0.224, 0.225])])
+
+
 # Process a PIL image for use in a PyTorch model
 def process_image(image_path):
     ''' Scales, crops, and normalizes a PIL image for a PyTorch model,
@@ -14,13 +23,9 @@ def process_image(image_path):
         image = rehsape the image
         image = image.numpy()
     '''    
-    image = Image.open(image_path)
-    image_transform = transforms.Compose([transforms.Resize(255),
-                                          transforms.CenterCrop(224),
-                                          transforms.ToTensor(),
-                                          transforms.Normalize(
-                                              [0.485, 0.456, 0.406],
-                                              [0.229, 0.224, 0.225])])
+    # Convert to RGB, so grayscale and RGBA images have 3 channels
+    image = Image.open(image_path).convert('RGB')
+    image_transform = get_image_transform()
     image = image_transform(image)
 #     image = image.numpy()
     image.unsqueeze_(0)
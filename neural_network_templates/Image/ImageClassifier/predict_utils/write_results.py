@@ -0,0 +1,47 @@
+# Imports python modules
+import csv
+import json
+
+
+def get_class_names(model, category_names: str) -> dict:
+    ''' Map output index of the model to name of the category (or to the class label if name is missing).'''
+    with open(category_names, 'r') as f:
+        cat_to_name = json.load(f)
+    idx_to_class = {idx: label for label, idx in model.class_to_idx.items()}
+
+    return {idx: cat_to_name.get(str(label), str(label)) for idx, label in idx_to_class.items()}
+
+
+def write_results(results, output: str, class_names: dict, top_k: int) -> (int, int):
+    ''' Stream predictions to JSON lines file or CSV file (chosen by extension of output file).
+
+        results - iterable of (paths, top_p, top_class, errors) batches, errors are (path, message) pairs
+        Images which could not be read are written as rows with error message.
+        Returns number of written predictions and number of unreadable images.
+    '''
+    written = 0
+    failed = 0
+    with open(output, 'w', newline='') as f:
+        if output.endswith('.csv'):
+            writer = csv.writer(f)
+            writer.writerow(['path'] +
+                            [column for k in range(1, top_k + 1) for column in (f'class_{k}', f'probability_{k}')] +
+                            ['error'])
+        for paths, top_p, top_class, errors in results:
+            for path, probabilities, classes in zip(paths, top_p.tolist(), top_class.tolist()):
+                names = [class_names.get(idx, str(idx)) for idx in classes]
+                if output.endswith('.csv'):
+                    writer.writerow([path] + [value for pair in zip(names, probabilities) for value in pair] + [''])
+                else:
+                    f.write(json.dumps({'path': path, 'classes': names, 'probabilities': probabilities}) + '\n')
+                written += 1
+            for path, error in errors:
+                if output.endswith('.csv'):
+                    writer.writerow([path] + [''] * (2 * top_k) + [error])
+                else:
+                    f.write(json.dumps({'path': path, 'error': error}) + '\n')
+                failed += 1
+            # Flush after each batch, so results can be followed while long run is in progress
+            f.flush()
+
+    return written, failed
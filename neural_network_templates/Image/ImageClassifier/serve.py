@@ -0,0 +1,102 @@
+# Imports python modules
+import io
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import torch
+
+# Imports functions created for this program
+from predict_utils.get_server_args import get_server_args
+from predict_utils.load_checkpoint import load_checkpoint
+from predict_utils.micro_batcher import MicroBatcher
+from predict_utils.process_image import process_image
+from predict_utils.write_results import get_class_names
+
+
+def get_handler(batcher: MicroBatcher, class_names: dict, default_top_k: int):
+    ''' Create request handler class bound to the batcher.
+
+        POST /predict?top_k=K with image file as body returns top K classes with probabilities.
+        GET /health returns number of served images and batches.
+    '''
+    class InferenceHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, content: dict):
+            body = json.dumps(content).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if urlparse(self.path).path != '/health':
+                return self._send_json(HTTPStatus.NOT_FOUND, {'error': 'Not found'})
+            mean_batch_size = batcher.images / batcher.batches if batcher.batches else None
+            self._send_json(HTTPStatus.OK, {'status': 'ok',
+                                            'images': batcher.images,
+                                            'batches': batcher.batches,
+                                            'mean_batch_size': mean_batch_size})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path != '/predict':
+                return self._send_json(HTTPStatus.NOT_FOUND, {'error': 'Not found'})
+            try:
+                top_k = int(parse_qs(url.query).get('top_k', [default_top_k])[0])
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                # Decode and transform image in the request thread, so requests are processed in parallel
+                image = process_image(io.BytesIO(body))[0]
+            except Exception as error:
+                return self._send_json(HTTPStatus.BAD_REQUEST, {'error': f'Invalid request: {error}'})
+            if not 1 <= top_k <= len(class_names):
+                return self._send_json(HTTPStatus.BAD_REQUEST,
+                                       {'error': f'Invalid request: top_k must be between 1 and {len(class_names)}'})
+
+            try:
+                top_p, top_class = batcher.submit(image, top_k).result()
+            except Exception as error:
+                return self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f'Prediction failed: {error}'})
+            self._send_json(HTTPStatus.OK, {'classes': [class_names.get(idx, str(idx)) for idx in top_class.tolist()],
+                                            'probabilities': top_p.tolist()})
+
+        def log_message(self, format, *args):
+            # Do not print every request
+            pass
+
+    return InferenceHandler
+
+
+# Main program function defined below
+def main():
+    # Get command line arguments
+    in_arg = get_server_args()
+
+    if in_arg.threads:
+        torch.set_num_threads(in_arg.threads)
+    if in_arg.gpu:
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    else:
+        device = "cpu"
+
+    # Load model from checkpoint only once
+    model = load_checkpoint(in_arg.checkpoint)
+    batcher = MicroBatcher(model, device, in_arg.max_batch_size, in_arg.max_wait_ms / 1000)
+    batcher.start()
+
+    server = ThreadingHTTPServer((in_arg.host, in_arg.port),
+                                 get_handler(batcher, get_class_names(model, in_arg.category_names), in_arg.top_k))
+    print(f"Serving predictions on http://{in_arg.host}:{in_arg.port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.stop()
+
+
+# Call to main function to run the program
+if __name__ == "__main__":
+    main()
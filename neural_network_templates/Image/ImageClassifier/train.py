@@ -1,8 +1,14 @@
 # Imports python modules
+import torch
 
 # Imports functions created for this program
 from train_utils.get_input_args import get_input_args
 from train_utils.get_loader import get_loader
+from train_utils.get_loader import get_datasets
+from train_utils.get_loader import get_directories
+from train_utils.get_loader import get_transforms
+from train_utils.feature_cache import check_feature_cache_arch
+from train_utils.feature_cache import get_feature_loaders
 from train_utils.create_model import create_model
 from train_utils.train_model import train_model
 from train_utils.save_model import save_model
@@ -15,18 +21,42 @@ def main():
 
     # Check command line arguments
     # TODO: Nice to have: check_command_line_arguments(in_arg)
-    
-    # Get data
-    loader = get_loader(in_arg.data_dir)
+    if in_arg.feature_cache:
+        # Fail before model is downloaded and images are decoded
+        check_feature_cache_arch(in_arg.arch)
     
     # Get model
     model = create_model(in_arg.arch, in_arg.hidden_units)
+
+    # Get data
+    if in_arg.feature_cache:
+        # Run frozen backbone once, classifier trains on cached features
+        device = torch.device("cuda" if in_arg.gpu and torch.cuda.is_available() else "cpu")
+        datasets = get_datasets(get_directories(in_arg.data_dir), get_transforms(), in_arg.image_cache,
+                                in_arg.num_workers)
+        loader = get_feature_loaders(model, in_arg.arch, datasets, in_arg.feature_cache, device, in_arg.augmentations,
+                                     in_arg.batch_size, in_arg.valid_batch_size, in_arg.num_workers)
+        class_to_idx = datasets['train'].class_to_idx
+    else:
+        loader = get_loader(in_arg.data_dir,
+                            batch_size=in_arg.batch_size,
+                            valid_batch_size=in_arg.valid_batch_size,
+                            num_workers=in_arg.num_workers,
+                            prefetch_factor=in_arg.prefetch_factor,
+                            pin_memory=in_arg.gpu and torch.cuda.is_available(),
+                            image_cache=in_arg.image_cache)
+        class_to_idx = loader['train'].dataset.class_to_idx
     
     # Train model
-    model, optimizer = train_model(model, loader, in_arg.gpu, in_arg.learning_rate, in_arg.epochs)
+    model, optimizer = train_model(model, loader, in_arg.gpu, in_arg.learning_rate, in_arg.epochs,
+                                   cached_features=bool(in_arg.feature_cache),
+                                   validate_every_steps=in_arg.validate_every_steps,
+                                   validate_every_seconds=in_arg.validate_every_seconds,
+                                   validate_every_epoch=not in_arg.no_validate_every_epoch,
+                                   valid_fraction=in_arg.valid_fraction)
     
     # Save model
-    save_model(model, optimizer, in_arg.save_dir)
+    save_model(model, optimizer, in_arg.save_dir, class_to_idx)
         
 
 # Call to main function to run the program
@@ -0,0 +1,135 @@
+# Imports python modules
+import hashlib
+import json
+import os
+
+import numpy as np
+import torch
+import torchvision.models
+
+# Imports functions created for this program
+from train_utils.image_cache import get_files_state
+
+FEATURES_SIZE = 25088  # Size of flattened output of VGG features, the input of our own classifier
+FEATURE_CACHE_ARCHS = ('vgg13', 'vgg16')  # Architectures with VGG features and avgpool
+
+
+def check_feature_cache_arch(arch: str):
+    ''' Feature cache runs VGG features and avgpool and stores FEATURES_SIZE values per image, other
+        architectures are not supported.
+    '''
+    if arch not in FEATURE_CACHE_ARCHS:
+        raise ValueError(f"Feature cache supports only {', '.join(FEATURE_CACHE_ARCHS)} architectures, got {arch}.")
+
+
+def extract_features(model: torchvision.models, inputs: torch.Tensor) -> torch.Tensor:
+    ''' Run frozen part of VGG model, output is the input of model.classifier.'''
+    return torch.flatten(model.avgpool(model.features(inputs)), 1)
+
+
+def get_samples_hash(dataset: torch.utils.data.Dataset) -> str:
+    ''' Hash of paths, labels, modification times and sizes of all images of ImageFolder like dataset.'''
+    files = get_files_state([path for path, _ in dataset.samples])
+    samples = [file + [label] for file, (_, label) in zip(files, dataset.samples)]
+
+    return hashlib.sha256(json.dumps(samples).encode()).hexdigest()
+
+
+def build_feature_cache(model: torchvision.models, arch: str, dataset: torch.utils.data.Dataset, cache_path: str,
+                        device, augmentations: int = 1, batch_size: int = 64,
+                        num_workers: int = 0) -> (np.memmap, np.ndarray):
+    ''' Run frozen backbone once over dataset and store activations in memory-mapped float16 array.
+
+        Dataset is passed augmentations times, with random transforms each pass gives different fixed
+        augmentation of every image. Cache is reused when it was built with the same architecture,
+        images (paths, labels, modification times and sizes), transforms and number of augmentations.
+    '''
+    features_path, labels_path, meta_path = (f'{cache_path}.features.npy', f'{cache_path}.labels.npy',
+                                             f'{cache_path}.json')
+    meta = {'arch': arch,
+            'images': len(dataset),
+            'samples': get_samples_hash(dataset),
+            'transform': repr(dataset.transform),
+            'augmentations': augmentations,
+            'features_size': FEATURES_SIZE}
+    if os.path.exists(meta_path) and os.path.exists(features_path) and os.path.exists(labels_path):
+        with open(meta_path, 'r') as f:
+            if json.load(f) == meta:
+                return np.load(features_path, mmap_mode='r'), np.load(labels_path)
+
+    # Remove description of old cache, so interrupted build is never reused
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    features = np.lib.format.open_memmap(features_path, mode='w+', dtype=np.float16,
+                                         shape=(len(dataset) * augmentations, FEATURES_SIZE))
+    labels = np.empty(len(dataset) * augmentations, dtype=np.int64)
+
+    model.to(device)
+    # Turn on model evaluation mode, backbone is frozen
+    model.eval()
+    loader = torch.utils.data.DataLoader(dataset, batch_size=batch_size, num_workers=num_workers,
+                                         pin_memory=str(device) != 'cpu')
+    position = 0
+    with torch.inference_mode():
+        for augmentation in range(augmentations):
+            for inputs, targets in loader:
+                batch_features = extract_features(model, inputs.to(device))
+                features[position:position + len(targets)] = batch_features.half().cpu().numpy()
+                labels[position:position + len(targets)] = targets.numpy()
+                position += len(targets)
+            print(f"Features of augmentation {augmentation + 1}/{augmentations} cached.")
+    features.flush()
+    np.save(labels_path, labels)
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f)
+
+    return np.load(features_path, mmap_mode='r'), labels
+
+
+class CachedFeatures(torch.utils.data.Dataset):
+    ''' Dataset of cached features indexed by whole batch of indices, so batch is read from memmap at once.'''
+    def __init__(self, features: np.memmap, labels: np.ndarray):
+        self.features = features
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, indices: list):
+        # Sorted indices read memory-mapped file in order
+        indices = np.sort(np.asarray(indices))
+        return (torch.from_numpy(np.ascontiguousarray(self.features[indices])).float(),
+                torch.from_numpy(self.labels[indices]))
+
+
+def get_feature_loader(features: np.memmap, labels: np.ndarray, batch_size: int,
+                       shuffle: bool) -> torch.utils.data.DataLoader:
+    dataset = CachedFeatures(features, labels)
+    if shuffle:
+        sampler = torch.utils.data.RandomSampler(dataset)
+    else:
+        sampler = torch.utils.data.SequentialSampler(dataset)
+    # batch_size=None, because sampler already gives batches of indices
+    return torch.utils.data.DataLoader(dataset,
+                                       sampler=torch.utils.data.BatchSampler(sampler, batch_size, drop_last=False),
+                                       batch_size=None)
+
+
+def get_feature_loaders(model: torchvision.models, arch: str, datasets: dict, cache_dir: str, device,
+                        augmentations: int = 1, batch_size: int = 64, valid_batch_size: int = 32,
+                        num_workers: int = 0) -> dict:
+    ''' Cache features of train (with augmentations) and valid datasets, return loaders of cached features.'''
+    check_feature_cache_arch(arch)
+    train_features, train_labels = build_feature_cache(model, arch, datasets['train'],
+                                                       os.path.join(cache_dir, 'train'), device, augmentations,
+                                                       num_workers=num_workers)
+    valid_features, valid_labels = build_feature_cache(model, arch, datasets['valid'],
+                                                       os.path.join(cache_dir, 'valid'), device,
+                                                       num_workers=num_workers)
+
+    return {'train': get_feature_loader(train_features, train_labels, batch_size, shuffle=True),
+            'valid': get_feature_loader(valid_features, valid_labels, valid_batch_size, shuffle=False)}
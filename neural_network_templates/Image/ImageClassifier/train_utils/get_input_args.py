@@ -34,4 +34,52 @@ def get_input_args() -> argparse.Namespace:
     parser.add_argument('--gpu', action='store_true', default=False,
                         help='Flag for turning on GPU computing.')
 
+    # Argument 8: a path to the cache of frozen features
+    parser.add_argument('--feature_cache', type=str, default=None,
+                        help='Path to the folder for cached features of frozen backbone. When passed, backbone runs '
+                             'once over data set and classifier trains on cached features. Only for vgg13 and vgg16.')
+
+    # Argument 9: a number of cached augmentations
+    parser.add_argument('--augmentations', type=int, default=1,
+                        help='Number of fixed random augmentations of train set cached with --feature_cache.')
+
+    # Argument 10: a number of images in training batch
+    parser.add_argument('--batch_size', type=int, default=64,
+                        help='Number of images in training batch.')
+
+    # Argument 11: a number of images in validation and test batch
+    parser.add_argument('--valid_batch_size', type=int, default=32,
+                        help='Number of images in validation and test batch.')
+
+    # Argument 12: a number of processes loading images
+    parser.add_argument('--num_workers', type=int, default=0,
+                        help='Number of DataLoader worker processes decoding and augmenting images.')
+
+    # Argument 13: a number of batches prepared in advance
+    parser.add_argument('--prefetch_factor', type=int, default=2,
+                        help='Number of batches prepared in advance by each worker (only with --num_workers > 0).')
+
+    # Argument 14: a path to the cache of decoded images
+    parser.add_argument('--image_cache', type=str, default=None,
+                        help='Path to the folder for decoded and resized images. When passed, images are decoded '
+                             'once into memory-mapped file and next epochs skip decoding. Images are stored whole '
+                             'with shorter side resized to 256 pixels, so training augmentation crops the resized '
+                             'copy and not the full resolution image. Cache is rebuilt when any image file changes.')
+
+    # Argument 15: a number of training steps between validations
+    parser.add_argument('--validate_every_steps', type=int, default=None,
+                        help='Run validation every N training steps.')
+
+    # Argument 16: a time between validations
+    parser.add_argument('--validate_every_seconds', type=float, default=None,
+                        help='Run validation every N seconds of training.')
+
+    # Argument 17: a flag for turning off validation after each epoch
+    parser.add_argument('--no_validate_every_epoch', action='store_true', default=False,
+                        help='Flag for turning off validation at the end of every epoch.')
+
+    # Argument 18: a part of validation set used for validation
+    parser.add_argument('--valid_fraction', type=float, default=1.0,
+                        help='Part of validation set (fixed random subset) used in every validation.')
+
     return parser.parse_args()
@@ -1,8 +1,13 @@
 # Imports python modules
+import os
+
 import torch
 from torchvision import transforms
 from torchvision import datasets
 
+# Imports functions created for this program
+from train_utils.image_cache import CachedImageFolder
+
 
 def get_directories(data_dir: str) -> dict:
     train_dir = data_dir + '/train'
@@ -33,7 +38,13 @@ def get_transforms() -> dict:
     return {'train': train_transform, 'valid': valid_transform, 'test':test_transform}
 
 
-def get_datasets(directories: dict, transforms: dict) -> dict:    
+def get_datasets(directories: dict, transforms: dict, image_cache: str = None, num_workers: int = 0) -> dict:
+    if image_cache:
+        # Decode and resize images only once, next epochs and runs read them from memory-mapped cache
+        return {name: CachedImageFolder(directory, os.path.join(image_cache, name), transform=transforms[name],
+                                        num_workers=num_workers)
+                for name, directory in directories.items()}
+
     train_dataset = datasets.ImageFolder(directories['train'], transform=transforms['train'])
     valid_dataset = datasets.ImageFolder(directories['valid'], transform=transforms['valid'])
     test_dataset = datasets.ImageFolder(directories['test'], transform=transforms['test'])
@@ -41,7 +52,19 @@ def get_datasets(directories: dict, transforms: dict) -> dict:
     return {'train': train_dataset, 'valid': valid_dataset, 'test':test_dataset}
 
 
-def get_loader(data_dir: str) -> dict:
+def get_data_loader(dataset, batch_size: int, shuffle: bool = False, num_workers: int = 0, prefetch_factor: int = 2,
+                    pin_memory: bool = False) -> torch.utils.data.DataLoader:
+    if num_workers > 0:
+        # Workers decode next batches while model trains on current one and are kept alive between epochs
+        return torch.utils.data.DataLoader(dataset, batch_size=batch_size, shuffle=shuffle, num_workers=num_workers,
+                                           prefetch_factor=prefetch_factor, persistent_workers=True,
+                                           pin_memory=pin_memory)
+
+    return torch.utils.data.DataLoader(dataset, batch_size=batch_size, shuffle=shuffle, pin_memory=pin_memory)
+
+
+def get_loader(data_dir: str, batch_size: int = 64, valid_batch_size: int = 32, num_workers: int = 0,
+               prefetch_factor: int = 2, pin_memory: bool = False, image_cache: str = None) -> dict:
     # Create directories based on passed path
     directories = get_directories(data_dir)
     
@@ -49,11 +72,11 @@ def get_loader(data_dir: str) -> dict:
     transforms = get_transforms()
     
     # Load the datasets with ImageFolder for train set
-    datasets = get_datasets(directories, transforms)
+    datasets = get_datasets(directories, transforms, image_cache, num_workers)
     
     # Defined the dataloaders, using the image datasets and the trainforms
-    train_loader = torch.utils.data.DataLoader(datasets['train'], batch_size=64, shuffle=True)
-    valid_loader = torch.utils.data.DataLoader(datasets['valid'], batch_size=32)
-    test_loader = torch.utils.data.DataLoader(datasets['test'], batch_size=32)
+    train_loader = get_data_loader(datasets['train'], batch_size, True, num_workers, prefetch_factor, pin_memory)
+    valid_loader = get_data_loader(datasets['valid'], valid_batch_size, False, num_workers, prefetch_factor, pin_memory)
+    test_loader = get_data_loader(datasets['test'], valid_batch_size, False, num_workers, prefetch_factor, pin_memory)
     
     return {'train': train_loader, 'valid': valid_loader, 'test':test_loader}
@@ -0,0 +1,117 @@
+# Imports python modules
+import json
+import os
+
+import numpy as np
+import torch
+from PIL import Image
+from torchvision import datasets
+
+CACHED_IMAGE_SIZE = 256  # Images are stored with shorter side resized to 256 pixels, without cropping
+
+
+def get_cached_size(width: int, height: int) -> (int, int):
+    ''' Size of image with shorter side resized to CACHED_IMAGE_SIZE, aspect ratio is kept.'''
+    scale = CACHED_IMAGE_SIZE / min(width, height)
+    return max(CACHED_IMAGE_SIZE, round(width * scale)), max(CACHED_IMAGE_SIZE, round(height * scale))
+
+
+def decode_image(path: str) -> np.ndarray:
+    ''' Decode image and resize its shorter side to CACHED_IMAGE_SIZE, return uint8 array (height x width x 3).'''
+    with Image.open(path) as image:
+        image = image.convert('RGB')
+        image = image.resize(get_cached_size(*image.size), Image.BILINEAR)
+
+        return np.asarray(image, dtype=np.uint8)
+
+
+def get_files_state(paths: list) -> list:
+    ''' Path, modification time and size of every file, so replaced or re-encoded files invalidate cache.'''
+    files = []
+    for path in paths:
+        stat = os.stat(path)
+        files.append([path, stat.st_mtime_ns, stat.st_size])
+
+    return files
+
+
+class _DecodedImages(torch.utils.data.Dataset):
+    ''' Decode images in DataLoader workers while cache is built.'''
+    def __init__(self, paths: list):
+        self.paths = paths
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, index: int):
+        return index, torch.from_numpy(decode_image(self.paths[index]).reshape(-1))
+
+
+class CachedImageFolder(torch.utils.data.Dataset):
+    ''' ImageFolder whose images are decoded once into memory-mapped uint8 file, so epochs after the first
+        one skip JPEG decoding. Transforms (e.g. random augmentation) still run on every access.
+
+        Images are stored whole, with shorter side resized to CACHED_IMAGE_SIZE, so random crops of training
+        images still see the whole image (but at the resolution of the resized copy).
+    '''
+    def __init__(self, root: str, cache_path: str, transform=None, num_workers: int = 0):
+        folder = datasets.ImageFolder(root)
+        self.root = root
+        self.samples = folder.samples
+        self.targets = folder.targets
+        self.classes = folder.classes
+        self.class_to_idx = folder.class_to_idx
+        self.transform = transform
+        self.images, self.shapes = self._load_or_build(cache_path, num_workers)
+        # Start of every image in flat array of pixels
+        self.offsets = np.concatenate([[0], np.cumsum(self.shapes.prod(axis=1) * 3)])
+
+    def _load_or_build(self, cache_path: str, num_workers: int) -> (np.memmap, np.ndarray):
+        images_path, shapes_path, meta_path = (f'{cache_path}.images.npy', f'{cache_path}.shapes.npy',
+                                               f'{cache_path}.json')
+        paths = [path for path, _ in self.samples]
+        meta = {'files': get_files_state(paths), 'size': CACHED_IMAGE_SIZE}
+        if os.path.exists(meta_path) and os.path.exists(images_path) and os.path.exists(shapes_path):
+            with open(meta_path, 'r') as f:
+                if json.load(f) == meta:
+                    return np.load(images_path, mmap_mode='r'), np.load(shapes_path)
+
+        # Remove description of old cache, so interrupted build is never reused
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Read only headers of images to get their sizes, so flat array of all pixels can be allocated
+        shapes = []
+        for path in paths:
+            with Image.open(path) as image:
+                width, height = get_cached_size(*image.size)
+            shapes.append((height, width))
+        shapes = np.array(shapes, dtype=np.int64).reshape(-1, 2)
+        offsets = np.concatenate([[0], np.cumsum(shapes.prod(axis=1) * 3)])
+
+        images = np.lib.format.open_memmap(images_path, mode='w+', dtype=np.uint8, shape=(int(offsets[-1]),))
+        loader = torch.utils.data.DataLoader(_DecodedImages(paths), batch_size=None, num_workers=num_workers)
+        for index, pixels in loader:
+            images[offsets[index]:offsets[index + 1]] = pixels.numpy()
+        images.flush()
+        np.save(shapes_path, shapes)
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+        print(f"{len(self.samples)} images from {self.root} cached in {images_path}.")
+
+        return np.load(images_path, mmap_mode='r'), shapes
+
+    def __len__(self):
+        return len(self.samples)
+
+    def __getitem__(self, index: int):
+        height, width = self.shapes[index]
+        pixels = np.asarray(self.images[self.offsets[index]:self.offsets[index + 1]])
+        image = Image.fromarray(pixels.reshape(height, width, 3))
+        if self.transform is not None:
+            image = self.transform(image)
+
+        return image, self.targets[index]
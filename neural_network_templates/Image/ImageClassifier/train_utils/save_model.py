@@ -3,16 +3,10 @@ import torch
 import torchvision.models
 from torch import optim
 
-# Imports functions created for this program
-from train_utils.get_input_args import get_input_args
-from train_utils.get_loader import get_directories
-from train_utils.get_loader import get_transforms
-from train_utils.get_loader import get_datasets
 
-def save_model(model: torchvision.models, optimizer: optim.Adam, save_dir: str):
-    # Save the checkpoint 
-    dataset = get_datasets(get_directories(get_input_args().data_dir), get_transforms())
-    model.class_to_idx = dataset['train'].class_to_idx
+def save_model(model: torchvision.models, optimizer: optim.Adam, save_dir: str, class_to_idx: dict):
+    # Save the checkpoint, mapping of classes comes from train dataset used for training
+    model.class_to_idx = class_to_idx
 
     # Define checkpoint with parameters to be saved
     checkpoint = {'input_size': 25088,
@@ -1,4 +1,6 @@
 # Imports python modules
+import time
+
 import torch
 import torchvision.models
 from torch import nn
@@ -6,10 +8,21 @@ from torch import optim
 from datetime import datetime
 
 # Imports functions created for this program
+from train_utils.validation import ValidationScheduler
+from train_utils.validation import get_validation_subset
+from train_utils.validation import validate
 from workspace_utils import active_session
 
 
-def train_model(model: torchvision.models, loader: dict, gpu: bool, learning_rate: float, epochs: int) -> (torchvision.models, optim.Adam):
+def train_model(model: torchvision.models, loader: dict, gpu: bool, learning_rate: float, epochs: int,
+                cached_features: bool = False, validate_every_steps: int = None, validate_every_seconds: float = None,
+                validate_every_epoch: bool = True, valid_fraction: float = 1.0) -> (torchvision.models, optim.Adam):
+    ''' Train model.classifier. With cached_features loader gives cached outputs of frozen backbone
+        (see train_utils.feature_cache) instead of images, so only classifier is run.
+
+        Validation runs every validate_every_steps steps, every validate_every_seconds seconds and/or
+        at the end of every epoch, on valid_fraction of validation set (fixed random subset).
+    '''
     #---
     # INIT MODEL
     #---
@@ -22,7 +35,9 @@ def train_model(model: torchvision.models, loader: dict, gpu: bool, learning_rat
         device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     else:
         device = "cpu"
-    model.to(device)
+    # With cached features the backbone is not needed, train only the classifier
+    network = model.classifier if cached_features else model
+    network.to(device)
         
     # Setup loss function
     criterion = nn.NLLLoss()
@@ -35,22 +50,55 @@ def train_model(model: torchvision.models, loader: dict, gpu: bool, learning_rat
     #---
     # How many times we repeat the process
     steps = 0
-    running_loss = 0
-    print_every = 5
+    # Loss is accumulated on the device, so training steps do not wait for copying it to the host
+    running_loss = torch.zeros((), device=device)
+    running_steps = 0
+    running_images = 0
+    running_start = time.perf_counter()
     train_losses = []
     valid_losses = []
+    scheduler = ValidationScheduler(validate_every_steps, validate_every_seconds, validate_every_epoch)
+    valid_loader = get_validation_subset(loader['valid'], valid_fraction)
+
+    def report(epoch: int):
+        nonlocal running_loss, running_steps, running_images, running_start
+        # Copying loss to the host waits for queued training kernels, so time of training is measured after it
+        train_loss = running_loss.item() / max(running_steps, 1)
+        train_images_per_second = running_images / (time.perf_counter() - running_start)
+        metrics = validate(network, valid_loader, criterion, device)
+        scheduler.done()
+
+        # Add train and validation loss
+        train_losses.append(train_loss)
+        valid_losses.append(metrics['loss'])
+
+        # Print recaption after validation
+        step_time = datetime.now().strftime("%H:%M:%S")
+        print(f"{step_time}: "
+              f"Epoch {epoch+1}/{epochs}.. "
+              f"Step {steps}.. "
+              f"Train loss: {train_loss:.3f} ({train_images_per_second:.1f} images/s) ; "
+              f"Validation loss: {metrics['loss']:.3f}.. "
+              f"Validation accuracy: {metrics['accuracy']:.3f} ({metrics['images_per_second']:.1f} images/s)")
+
+        # Initiate values of loss and throughput for next report, time of validation is not counted
+        running_loss = torch.zeros((), device=device)
+        running_steps = 0
+        running_images = 0
+        running_start = time.perf_counter()
 
     # Training loop
     with active_session():
         for epoch in range(epochs):
+            validated = False
             # For each image in data set, train neural network model
             for inputs, labels in loader['train']:
                 steps += 1
                 # Move input and label tensors to the default device
-                inputs, labels = inputs.to(device), labels.to(device)
+                inputs, labels = inputs.to(device, non_blocking=True), labels.to(device, non_blocking=True)
 
                 # Calculating predicted output
-                output = model.forward(inputs)
+                output = network.forward(inputs)
                 # Calculating loss
                 loss = criterion(output, labels)
 
@@ -61,56 +109,16 @@ def train_model(model: torchvision.models, loader: dict, gpu: bool, learning_rat
                 # Update weights and biases
                 optimizer.step()
 
-                # Calculating loss for epoch
-                running_loss += loss.item()
-
-                # For each print_every (deaful 5) images calculate validation
-                if steps % print_every == 0:                                  
-                    # Initiate value of test loss after each epoch
-                    valid_loss = 0
-                    # Initiate value of accuracy after each epoch
-                    accuracy = 0
-                    # Turn off gradients for validation to save memory and computations                                
-                    with torch.no_grad():
-                        # Turn on model evaluation mode to turn off dropout
-                        model.eval()
-                        for inputs, labels in loader['valid']:
-                            # Move input and label tensors to the default device
-                            inputs, labels = inputs.to(device), labels.to(device)
-                            # Calculating test predicted output
-                            output = model.forward(inputs)
-                            # Calculating loss
-                            batch_loss = criterion(output, labels)                        
-
-                        # Calculate accuracy
-                            # Get class probability
-                            output_class_probability = torch.exp(output)
-                            # Get top highest values of probability for classes
-                            top_p, top_class = output_class_probability.topk(1, dim=1)
-                            # Calculate if classes are correct
-                            equals = top_class == labels.view(*top_class.shape)
-                            # Calculating accuracy
-                            accuracy += torch.mean(equals.type(torch.FloatTensor)).item()
-
-                            # Calculating test loss for epoch
-                            valid_loss += batch_loss.item()
-                    # Turn off evaluation mode and turn on training mode aka tunr on dropout
-                    model.train()
-
-                    # Add train loss for epoch
-                    train_losses.append(running_loss/len(loader['train']))
-                    # Add validation loss for epoch
-                    valid_losses.append(valid_loss/len(loader['valid']))
-
-                    # Print recaption after epoch
-                    step_time = datetime.now().strftime("%H:%M:%S")                
-                    print(f"{step_time}: "
-                          f"Epoch {epoch+1}/{epochs}.. "
-                          f"Train loss: {running_loss/print_every:.3f} ; "
-                          f"Validation loss: {valid_loss/len(loader['valid']):.3f}.. "
-                          f"Validation accuracy: {accuracy/len(loader['valid']):.3f}")
-                    
-                    # Initiate value of loss for each print_every (deaful 5) image 
-                    running_loss = 0 
-                    
+                # Calculating loss without synchronization with the device
+                running_loss += loss.detach()
+                running_steps += 1
+                running_images += len(labels)
+
+                validated = scheduler.is_due(steps)
+                if validated:
+                    report(epoch)
+
+            if scheduler.is_due_at_epoch_end(validated):
+                report(epoch)
+
     return model, optimizer
@@ -0,0 +1,78 @@
+# Imports python modules
+import time
+
+import torch
+from torch import nn
+
+
+class ValidationScheduler:
+    ''' Decide when validation runs: every N training steps, every T seconds and/or at the end of every epoch.'''
+    def __init__(self, every_steps: int = None, every_seconds: float = None, every_epoch: bool = True):
+        self.every_steps = every_steps
+        self.every_seconds = every_seconds
+        self.every_epoch = every_epoch
+        self.last_time = time.monotonic()
+
+    def is_due(self, step: int) -> bool:
+        ''' Check after training step if validation should run.'''
+        if self.every_steps and step % self.every_steps == 0:
+            return True
+        return bool(self.every_seconds) and time.monotonic() - self.last_time >= self.every_seconds
+
+    def is_due_at_epoch_end(self, validated_at_last_step: bool) -> bool:
+        return self.every_epoch and not validated_at_last_step
+
+    def done(self):
+        ''' Mark that validation just ran.'''
+        self.last_time = time.monotonic()
+
+
+def get_validation_subset(loader: torch.utils.data.DataLoader, fraction: float,
+                          seed: int = 0) -> torch.utils.data.DataLoader:
+    ''' Get loader of fixed random part of validation set, so validations are cheaper but comparable.'''
+    if fraction >= 1:
+        return loader
+    dataset = loader.dataset
+    size = max(1, int(len(dataset) * fraction))
+    indices = torch.randperm(len(dataset), generator=torch.Generator().manual_seed(seed))[:size]
+    subset = torch.utils.data.Subset(dataset, sorted(indices.tolist()))
+
+    if loader.batch_size is None:
+        # Loader of cached features reads whole batches of indices
+        sampler = torch.utils.data.BatchSampler(torch.utils.data.SequentialSampler(subset),
+                                                loader.sampler.batch_size, drop_last=False)
+        return torch.utils.data.DataLoader(subset, sampler=sampler, batch_size=None)
+    return torch.utils.data.DataLoader(subset, batch_size=loader.batch_size, num_workers=loader.num_workers,
+                                       persistent_workers=loader.num_workers > 0, pin_memory=loader.pin_memory)
+
+
+def validate(network: nn.Module, loader: torch.utils.data.DataLoader, criterion: nn.Module, device) -> dict:
+    ''' Count mean loss and accuracy over loader. Metrics are accumulated on the device
+        and copied to the host once, at the end of validation.
+    '''
+    loss_sum = torch.zeros((), device=device)
+    correct = torch.zeros((), device=device)
+    images = 0
+    start = time.perf_counter()
+
+    # Turn on model evaluation mode to turn off dropout
+    network.eval()
+    with torch.inference_mode():
+        for inputs, labels in loader:
+            # Move input and label tensors to the default device
+            inputs, labels = inputs.to(device, non_blocking=True), labels.to(device, non_blocking=True)
+            output = network.forward(inputs)
+            # Criterion gives mean of batch, weight it by size of batch
+            loss_sum += criterion(output, labels) * len(labels)
+            # Class with the highest log probability is the predicted class
+            correct += (output.argmax(dim=1) == labels).sum()
+            images += len(labels)
+    # Turn off evaluation mode and turn on training mode aka turn on dropout
+    network.train()
+
+    loss_sum, correct = torch.stack([loss_sum, correct.to(loss_sum.dtype)]).tolist()
+    elapsed = time.perf_counter() - start
+
+    return {'loss': loss_sum / max(images, 1),
+            'accuracy': correct / max(images, 1),
+            'images_per_second': images / elapsed if elapsed else 0.0}
@@ -1,46 +1,268 @@
 # External libraries
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy
 import pandas
 
 from loguru import logger
 from pandas.core.frame import DataFrame
 
+CACHE_DIRECTORY = "cache"
+CACHE_FORMAT_VERSION = 2
+# kinds of NumPy dtypes stored as they are: bool, integers, floats, complex numbers, datetimes and timedeltas
+VALUE_KINDS = "biufcmM"
+
+
+def read_source(source_file: str, sheet_name: str = None) -> DataFrame:
+    """
+    Read table from xlsx sheet, csv or parquet file.
+
+    :param (str) source_file: path to the source file.
+    :param (str) sheet_name: name of the excel sheet (only for xlsx file).
+
+    :return pandas.core.frame.DataFrame: dataframe with the table.
+    """
+    extension = os.path.splitext(source_file)[1].lower()
+    if extension in (".xlsx", ".xls"):
+        return pandas.read_excel(source_file, sheet_name, index_col=None)
+    if extension == ".csv":
+        return pandas.read_csv(source_file, delimiter=",")
+    if extension == ".parquet":
+        return pandas.read_parquet(source_file)
+    raise ValueError(f"Unsupported format of the source file {source_file}.")
+
+
+def file_hash(path: str) -> str:
+    """
+    Count hash of file content.
+
+    :param (str) path: path to the file.
+
+    :return str: sha256 hex digest of the file.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(2 ** 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def save_columnar(table: DataFrame, cache_file: str, source: dict) -> None:
+    """
+    Save table as columns in npz file. Columns with NumPy dtype (numbers, bools, datetimes) keep their dtype,
+    string columns are stored as int32 codes and unicode categories.
+
+    :param (pandas.core.frame.DataFrame) table: table to save.
+    :param (str) cache_file: path to the npz file (replaced atomically).
+    :param (dict) source: mtime, size and hash of the source file.
+    :raise ValueError: table has column which can not be loaded back equal, e.g. column mixing strings and numbers.
+    """
+    arrays, columns = {}, []
+    for i, name in enumerate(table.columns):
+        column = table[name]
+        if isinstance(column.dtype, numpy.dtype) and column.dtype.kind in VALUE_KINDS:
+            arrays[f"values_{i}"] = column.to_numpy()
+            columns.append({"name": name, "kind": "values"})
+        elif isinstance(column.dtype, pandas.StringDtype) or (
+                column.dtype == object and column.dropna().map(type).eq(str).all()):
+            codes, categories = pandas.factorize(column)
+            arrays[f"codes_{i}"] = codes.astype(numpy.int32)
+            arrays[f"categories_{i}"] = numpy.asarray(categories, dtype=str)
+            columns.append({"name": name, "kind": "strings", "dtype": str(column.dtype)})
+        else:
+            raise ValueError(f"Column {name} of type {column.dtype} can not be stored in columnar cache.")
+    meta = {"version": CACHE_FORMAT_VERSION, "source": source, "columns": columns}
+    arrays["meta"] = numpy.array(json.dumps(meta))
+    _write_npz(cache_file, arrays)
+
 
-def convert_xlsx_to_csv(source_file: str, sheet_name: str, csv_name: str) -> None:
+def _decode_strings(codes: numpy.ndarray, categories: numpy.ndarray) -> numpy.ndarray:
     """
-    Create csv file from converting sheet from xlsx file.
+    Decode column of strings saved as codes and categories.
 
-    :param (str) source_file: path to the source xlsx file.
-    :param (str) sheet_name : name of the excel sheet we want convert to csv file.
-    :param (str) csv_name: name of csv that will be created.
+    :param (numpy.ndarray) codes: code of every value (-1 for missing value).
+    :param (numpy.ndarray) categories: unique strings of the column.
+
+    :return numpy.ndarray: object array of strings with NaN for missing values.
+    """
+    values = numpy.full(len(codes), numpy.nan, dtype=object)
+    present = codes >= 0
+    values[present] = categories.astype(object)[codes[present]]
+
+    return values
+
+
+def _write_npz(cache_file: str, arrays: dict) -> None:
+    """
+    Write arrays to npz file through temporary file, so readers never see partially written cache.
+
+    :param (str) cache_file: path to the npz file.
+    :param (dict) arrays: arrays stored in the file by their names.
+    """
+    directory = os.path.dirname(cache_file) or "."
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temporary_file = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(file_descriptor, "wb") as file:
+        numpy.savez(file, **arrays)
+    os.replace(temporary_file, cache_file)
+
+
+def _refresh_source(cache_file: str, meta: dict, mtime: int) -> None:
     """
-    contextual_rating = pandas.read_excel(source_file, sheet_name, index_col=None)
-    contextual_rating.to_csv(csv_name, index=None)
+    Store new mtime of unchanged source file in the cache, so next loads do not hash the source again.
+
+    :param (str) cache_file: path to the npz file.
+    :param (dict) meta: metadata of the cache.
+    :param (int) mtime: current mtime of the source file in nanoseconds.
+    """
+    meta["source"]["mtime"] = mtime
+    with numpy.load(cache_file, allow_pickle=False) as cached:
+        arrays = {name: cached[name] for name in cached.files}
+    arrays["meta"] = numpy.array(json.dumps(meta))
+    _write_npz(cache_file, arrays)
+
+
+def load_columnar(cache_file: str) -> (dict, DataFrame):
+    """
+    Load table saved with save_columnar.
+
+    :param (str) cache_file: path to the npz file.
+
+    :return (dict, pandas.core.frame.DataFrame): metadata of the cache and the table.
+    """
+    with numpy.load(cache_file, allow_pickle=False) as arrays:
+        meta = json.loads(str(arrays["meta"]))
+        if meta["version"] != CACHE_FORMAT_VERSION:
+            raise ValueError(f"Cache version {meta['version']} is not supported, expected {CACHE_FORMAT_VERSION}.")
+        table = {}
+        for i, column in enumerate(meta["columns"]):
+            if column["kind"] == "values":
+                table[column["name"]] = arrays[f"values_{i}"]
+            else:
+                table[column["name"]] = pandas.array(
+                    _decode_strings(arrays[f"codes_{i}"], arrays[f"categories_{i}"]), dtype=column["dtype"]
+                )
+
+    return meta, DataFrame(table)
+
+
+def _read_cache(cache_file: str, source_file: str) -> DataFrame:
+    """
+    Read table from cache if cache was created from current version of the source file.
+
+    Source is unchanged when its mtime and size are equal to cached ones. Otherwise hash of the source is compared,
+    so touching the file does not invalidate the cache, and new mtime is stored, so the source is hashed only once.
+
+    :param (str) cache_file: path to the npz file.
+    :param (str) source_file: path to the source file.
+
+    :return pandas.core.frame.DataFrame: cached table (None if cache is missing or stale).
+    """
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        meta, table = load_columnar(cache_file)
+    except (OSError, ValueError, KeyError) as error:
+        logger.warning(f"Cache {cache_file} is not readable: {error}")
+        return None
+
+    stat = os.stat(source_file)
+    source = meta["source"]
+    if (source["mtime"], source["size"]) == (stat.st_mtime_ns, stat.st_size):
+        return table
+    if source["size"] == stat.st_size and source["hash"] == file_hash(source_file):
+        try:
+            _refresh_source(cache_file, meta, stat.st_mtime_ns)
+        except OSError as error:
+            logger.warning(f"Cache {cache_file} is not writable: {error}")
+        return table
+
+    return None
+
+
+def load_table(source_file: str, sheet_name: str = None, cache_directory: str = None) -> DataFrame:
+    """
+    Load table from columnar cache, converting source file to the cache only when the source changed.
+
+    :param (str) source_file: path to the xlsx, csv or parquet file.
+    :param (str) sheet_name: name of the excel sheet (only for xlsx file).
+    :param (str) cache_directory: directory of the cache (default: cache directory next to the source file).
+
+    :return pandas.core.frame.DataFrame: dataframe with the table.
+    """
+    cache_directory = cache_directory or os.path.join(os.path.dirname(source_file), CACHE_DIRECTORY)
+    cache_name = os.path.basename(source_file) + (f".{sheet_name}" if sheet_name else "") + ".npz"
+    cache_file = os.path.join(cache_directory, cache_name)
+
+    table = _read_cache(cache_file, source_file)
+    if table is not None:
+        logger.debug(f"Loaded {source_file} {sheet_name or ''} from cache {cache_file}")
+        return table
+
+    logger.debug(f"Converting {source_file} {sheet_name or ''} to cache {cache_file}...")
+    stat = os.stat(source_file)
+    source = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "hash": file_hash(source_file)}
+    table = read_source(source_file, sheet_name)
+    try:
+        save_columnar(table, cache_file, source)
+    except ValueError as error:
+        logger.warning(f"Table {source_file} {sheet_name or ''} is not cached: {error}")
+
+    return table
+
+
+def _rename_columns(user_contextual_rating: DataFrame, songs: DataFrame) -> (DataFrame, DataFrame):
+    """
+    Remove leading spaces from names of the columns used by the model.
+
+    :param (pandas.core.frame.DataFrame) user_contextual_rating: dataframe of user contextual rating.
+    :param (pandas.core.frame.DataFrame) songs: dataframe of songs.
+
+    :return (pandas.core.frame.DataFrame, pandas.core.frame.DataFrame): dataframes with renamed columns.
+    """
+    user_contextual_rating = user_contextual_rating.rename(columns={" Rating": "Rating"})
+    songs = songs.rename(columns={" title": "title"})
+
+    return user_contextual_rating, songs
 
 
 def run(base_path: str, excel_name: str) -> (DataFrame, DataFrame):
     """
     Load input data of user contextual rating and songs from xlsx file.
 
+    Sheets are converted to columnar cache on the first run, next runs read the cache while xlsx file is unchanged.
+
     :param (str) base_path : path to data.
     :param (str) excel_name: name of excel file.
 
     :return (pandas.core.frame.DataFrame, pandas.core.frame.DataFrame): dataframe of user contextual rating and songs.
     """
-    contextual_rating_csv_name = "Data_InCarMusic_ContextualRating.csv"
-    music_track_csv_name = "Data_InCarMusic_MusicTrack.csv"
-
     # logger.info("Downloading xlsx data...")
     # TODO: Nice to have: downloading and extracting zip xlsx file
 
-    logger.debug("Creating csv files from xlsx...")
-    convert_xlsx_to_csv(f"{base_path}/{excel_name}", "ContextualRating", f"{base_path}/{contextual_rating_csv_name}")
-    convert_xlsx_to_csv(f"{base_path}/{excel_name}", "Music Track", f"{base_path}/{music_track_csv_name}")
+    logger.debug("Loading data to memory as dataframes...")
+    user_contextual_rating = load_table(f"{base_path}/{excel_name}", "ContextualRating")
+    songs = load_table(f"{base_path}/{excel_name}", "Music Track")
 
-    logger.debug("Loading csv data to memory as dataframes...")
-    user_contextual_rating = pandas.read_csv(f"{base_path}/{contextual_rating_csv_name}", delimiter=",")
-    songs = pandas.read_csv(f"{base_path}/{music_track_csv_name}", delimiter=",")
+    return _rename_columns(user_contextual_rating, songs)
 
-    user_contextual_rating = user_contextual_rating.rename(columns={" Rating": "Rating"})
-    songs = songs.rename(columns={" title": "title"})
 
-    return user_contextual_rating, songs
+def run_files(base_path: str, rating_name: str, songs_name: str) -> (DataFrame, DataFrame):
+    """
+    Load input data of user contextual rating and songs from separate csv or parquet files.
+
+    :param (str) base_path : path to data.
+    :param (str) rating_name: name of csv or parquet file with user contextual rating.
+    :param (str) songs_name: name of csv or parquet file with songs.
+
+    :return (pandas.core.frame.DataFrame, pandas.core.frame.DataFrame): dataframe of user contextual rating and songs.
+    """
+    logger.debug("Loading data to memory as dataframes...")
+    user_contextual_rating = load_table(f"{base_path}/{rating_name}")
+    songs = load_table(f"{base_path}/{songs_name}")
+
+    return _rename_columns(user_contextual_rating, songs)
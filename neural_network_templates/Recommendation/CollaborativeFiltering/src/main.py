@@ -1,12 +1,26 @@
 # External libraries
-from fastapi import FastAPI
+import fcntl
+import os
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from typing import List
+
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import JSONResponse
 from loguru import logger
+from pydantic import BaseModel, Field
 
 # Internal libraries
 import model
 from data import load_data
+from model import artifact
+from model.loader import ModelLoader
 from model.recommender import prepare_model
 
+DATA_PATH = "data"
+EXCEL_NAME = "Data_InCarMusic.xlsx"
+ARTIFACT_PATH = os.environ.get("RECOMMENDER_ARTIFACT", "artifacts/recommender")
+
 
 def create_model() -> model.recommender.Recommender:
     """
@@ -16,7 +30,7 @@ def create_model() -> model.recommender.Recommender:
     """
     logger.debug("Preparing the data...")
     # TODO: Nice to have: passing name of the xlsx file and rest of the data
-    rating, songs = load_data.run("data", "Data_InCarMusic.xlsx")
+    rating, songs = load_data.run(DATA_PATH, EXCEL_NAME)
 
     logger.debug("Preparing data matrix...")
     recommender_model = prepare_model(rating, songs)
@@ -24,9 +38,83 @@ def create_model() -> model.recommender.Recommender:
     return recommender_model
 
 
-# create global model only once
-recommendation_model = create_model()
-app = FastAPI()
+def _load_artifact(data_hash: str) -> model.recommender.Recommender:
+    """
+    Load recommendation model from artifact if artifact was created from current data.
+
+    :param (str) data_hash: hash of the data file.
+
+    :return model.recommender.Recommender: recommendation model (None if artifact is missing or stale).
+    """
+    try:
+        if artifact.read_meta(ARTIFACT_PATH)["metadata"].get("data_hash") == data_hash:
+            return artifact.load_recommender(ARTIFACT_PATH, mmap=True)
+        logger.debug("Artifact was created from different data")
+    except (OSError, ValueError, KeyError) as error:
+        logger.debug(f"Artifact is not available: {error}")
+
+    return None
+
+
+def load_or_create_model() -> model.recommender.Recommender:
+    """
+    Load recommendation model from artifact, or create model and save it as artifact if artifact is missing
+    or was created from different data.
+
+    Model is created under lock file, so when several workers start without artifact only one of them creates it
+    and the others load it.
+
+    :return model.recommender.Recommender: recommendation model.
+    """
+    data_hash = load_data.file_hash(f"{DATA_PATH}/{EXCEL_NAME}")
+    recommender_model = _load_artifact(data_hash)
+    if recommender_model is not None:
+        return recommender_model
+
+    os.makedirs(os.path.dirname(os.path.abspath(ARTIFACT_PATH)), exist_ok=True)
+    with open(f"{ARTIFACT_PATH}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        # another worker could create the artifact while we were waiting for the lock
+        recommender_model = _load_artifact(data_hash)
+        if recommender_model is not None:
+            return recommender_model
+
+        recommender_model = create_model()
+        artifact.save_recommender(recommender_model, ARTIFACT_PATH, metadata={"data_hash": data_hash})
+
+    return recommender_model
+
+
+def get_model() -> model.recommender.Recommender:
+    """
+    Get recommendation model if it is ready.
+
+    :return model.recommender.Recommender: recommendation model.
+    :raise HTTPException: service unavailable if model is not ready yet.
+    """
+    if not model_loader.ready:
+        raise HTTPException(status_code=HTTPStatus.SERVICE_UNAVAILABLE, detail="Model is not ready")
+
+    return model_loader.model
+
+
+class BatchRecommendationRequest(BaseModel):
+    """
+    Body of the request for recommendations for many songs.
+    """
+    song_names: List[str]
+    number_of_recommendations: int = Field(5, ge=1)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    model_loader.start()
+    yield
+
+
+# create global model only once, in background, so workers start serving without waiting for the model
+model_loader = ModelLoader(load_or_create_model)
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/")
@@ -34,8 +122,31 @@ def get_root() -> dict:
     return {"STATUS": "Klinesso Recommender API"}
 
 
+@app.get("/ready")
+def get_ready():
+    """
+    Check if recommendation model is ready to serve recommendations.
+
+    :return dict: dict with readiness status (status code 503 while model is prepared).
+    """
+    if model_loader.ready:
+        return {"READY": True}
+
+    return JSONResponse(status_code=HTTPStatus.SERVICE_UNAVAILABLE, content={"READY": False})
+
+
+@app.get("/metrics")
+def get_metrics() -> dict:
+    """
+    Get statistics of the cache of recommendation results.
+
+    :return dict: dict with hits, misses, hit rate and size of the cache.
+    """
+    return {"result_cache": get_model().result_cache.stats()}
+
+
 @app.get("/recommend/{song_name}")
-def recommend(song_name: str, number_of_recommendations: int = 5) -> dict:
+def recommend(song_name: str, number_of_recommendations: int = Query(5, ge=1)) -> dict:
     """
     Get the list of recommended songs based on passed song title from the list of existing song titles.
 
@@ -44,9 +155,26 @@ def recommend(song_name: str, number_of_recommendations: int = 5) -> dict:
 
     :return dict: dict with list of recommendations based on passed song.
     """
-    recommendations = recommendation_model.make_recommendation(
+    recommendations = get_model().make_recommendation(
         new_song=song_name,
         n_recommendations=number_of_recommendations
     )
 
     return {"Recommendations": recommendations}
+
+
+@app.post("/recommend/batch")
+def recommend_batch(request: BatchRecommendationRequest) -> dict:
+    """
+    Get the lists of recommended songs based on passed song titles from the list of existing song titles.
+
+    :param (BatchRecommendationRequest) request: names of the songs and number of recommendations we want to have.
+
+    :return dict: dict with list of recommendations for every passed song, in order of passed songs.
+    """
+    recommendations = get_model().make_recommendations_batch(
+        song_titles=request.song_names,
+        n_recommendations=request.number_of_recommendations
+    )
+
+    return {"Recommendations": recommendations}
@@ -0,0 +1,110 @@
+# External libraries
+import json
+import os
+import shutil
+import tempfile
+
+import numpy
+
+from loguru import logger
+from scipy.sparse import csr_matrix
+
+# Internal libraries
+from model.neighbor_index import NeighborIndex
+from model.recommender import Recommender
+
+ARTIFACT_VERSION = 1
+META_FILE = "meta.json"
+MATRIX_ARRAYS = ("data", "indices", "indptr")
+
+
+def save_recommender(recommender: Recommender, path: str, metadata: dict = None) -> None:
+    """
+    Save recommender as versioned directory of NumPy arrays, so it can be loaded with memory mapping.
+
+    Artifact is written to temporary directory first and then moved to the path, so readers never see
+    partially written artifact.
+
+    :param (Recommender) recommender: recommender to save.
+    :param (str) path: path to the artifact directory (replaced if exists).
+    :param (dict) metadata: additional JSON serializable information stored with artifact, e.g. hash of data.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    temporary_path = tempfile.mkdtemp(dir=parent, prefix=".artifact-")
+
+    data = recommender.data.tocsr()
+    for name in MATRIX_ARRAYS:
+        numpy.save(os.path.join(temporary_path, f"matrix_{name}.npy"), getattr(data, name))
+    numpy.save(os.path.join(temporary_path, "titles.npy"), numpy.array(list(recommender.decode_id_song), dtype=str))
+    numpy.save(os.path.join(temporary_path, "title_ids.npy"),
+               numpy.array(list(recommender.decode_id_song.values()), dtype=numpy.int64))
+    if recommender.neighbor_index is not None:
+        recommender.neighbor_index.save(temporary_path)
+
+    meta = {
+        "version": ARTIFACT_VERSION,
+        "metric": recommender.metric,
+        "algorithm": recommender.algorithm,
+        "k": recommender.k,
+        "shape": list(data.shape),
+        "neighbor_index": recommender.neighbor_index is not None,
+        "metadata": metadata or {},
+    }
+    with open(os.path.join(temporary_path, META_FILE), "w") as file:
+        json.dump(meta, file)
+
+    old_path = None
+    if os.path.exists(path):
+        old_path = tempfile.mkdtemp(dir=parent, prefix=".artifact-old-")
+        os.replace(path, os.path.join(old_path, "artifact"))
+    os.replace(temporary_path, path)
+    if old_path:
+        shutil.rmtree(old_path)
+    logger.debug(f"Recommender saved to {path}")
+
+
+def read_meta(path: str) -> dict:
+    """
+    Read description of the artifact.
+
+    :param (str) path: path to the artifact directory.
+
+    :return dict: description of the artifact with metadata passed to save_recommender.
+    """
+    with open(os.path.join(path, META_FILE)) as file:
+        meta = json.load(file)
+    if meta["version"] != ARTIFACT_VERSION:
+        raise ValueError(f"Artifact version {meta['version']} is not supported, expected {ARTIFACT_VERSION}.")
+
+    return meta
+
+
+def load_recommender(path: str, mmap: bool = True, **recommender_arguments) -> Recommender:
+    """
+    Load recommender saved with save_recommender.
+
+    :param (str) path: path to the artifact directory.
+    :param (bool) mmap: memory-map arrays, so processes loading the same artifact share memory pages.
+    :param recommender_arguments: additional arguments of Recommender, e.g. backend or cache_size.
+
+    :return Recommender: recommender ready to make recommendations.
+    """
+    meta = read_meta(path)
+    mmap_mode = "r" if mmap else None
+    matrix = [numpy.load(os.path.join(path, f"matrix_{name}.npy"), mmap_mode=mmap_mode) for name in MATRIX_ARRAYS]
+    data = csr_matrix(tuple(matrix), shape=tuple(meta["shape"]), copy=False)
+    titles = numpy.load(os.path.join(path, "titles.npy"))
+    title_ids = numpy.load(os.path.join(path, "title_ids.npy"))
+    neighbor_index = NeighborIndex.load(path, mmap=mmap) if meta["neighbor_index"] else None
+
+    logger.debug(f"Recommender loaded from {path}")
+    return Recommender(
+        metric=meta["metric"],
+        algorithm=meta["algorithm"],
+        k=meta["k"],
+        data=data,
+        decode_id_song=dict(zip(titles.tolist(), title_ids.tolist())),
+        neighbor_index=neighbor_index,
+        **recommender_arguments
+    )
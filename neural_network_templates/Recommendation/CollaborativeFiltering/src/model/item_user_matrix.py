@@ -0,0 +1,70 @@
+# External libraries
+import numpy
+
+from loguru import logger
+from pandas.core.frame import DataFrame
+from scipy.sparse import csr_matrix
+
+AGGREGATIONS = ("mean", "sum", "max")
+
+
+def _collect_triples(rating, item_column: str, user_column: str, value_column: str) -> tuple:
+    """
+    Collect item, user and rating columns of one dataframe or of chunks of dataframe.
+
+    :param rating: dataframe or iterable of dataframes (e.g. pandas.read_csv with chunksize).
+
+    :return (numpy.ndarray, numpy.ndarray, numpy.ndarray): items, users and ratings of all rows with rating.
+    """
+    chunks = [rating] if isinstance(rating, DataFrame) else rating
+    items, users, values = [], [], []
+    for chunk in chunks:
+        chunk = chunk[chunk[value_column].notna()]
+        items.append(chunk[item_column].to_numpy())
+        users.append(chunk[user_column].to_numpy())
+        values.append(chunk[value_column].to_numpy(dtype=numpy.float64))
+
+    return numpy.concatenate(items), numpy.concatenate(users), numpy.concatenate(values)
+
+
+def build_item_user_matrix(rating, item_column: str = "ItemID", user_column: str = "UserID",
+                           value_column: str = "Rating", aggregation: str = "mean") -> (csr_matrix, numpy.ndarray):
+    """
+    Build sparse item-user matrix directly from rating triples, without dense pivot table.
+
+    Items and users are mapped to categorical codes in sorted order, so matrix equals
+    pandas.pivot_table(rating, index=item_column, columns=user_column, values=value_column).fillna(0).
+
+    :param rating: dataframe or iterable of dataframes (e.g. pandas.read_csv with chunksize) with ratings.
+    :param (str) item_column: name of column with item id.
+    :param (str) user_column: name of column with user id.
+    :param (str) value_column: name of column with rating.
+    :param (str) aggregation: aggregation of duplicate ratings of item by user, one of AGGREGATIONS.
+
+    :return (csr_matrix, numpy.ndarray): item-user matrix and item id of every row of matrix.
+    """
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"Aggregation must be one of {AGGREGATIONS}, not {aggregation}.")
+    items, users, values = _collect_triples(rating, item_column, user_column, value_column)
+
+    logger.debug(f"Mapping {len(values)} ratings to categorical codes...")
+    item_ids, item_codes = numpy.unique(items, return_inverse=True)
+    user_ids, user_codes = numpy.unique(users, return_inverse=True)
+    pairs, pair_codes = numpy.unique(item_codes.astype(numpy.int64) * len(user_ids) + user_codes, return_inverse=True)
+
+    logger.debug(f"Aggregating duplicate ratings with {aggregation}...")
+    if aggregation == "max":
+        aggregated = numpy.full(len(pairs), -numpy.inf)
+        numpy.maximum.at(aggregated, pair_codes, values)
+    else:
+        aggregated = numpy.bincount(pair_codes, weights=values, minlength=len(pairs))
+        if aggregation == "mean":
+            aggregated /= numpy.bincount(pair_codes, minlength=len(pairs))
+
+    matrix = csr_matrix(
+        (aggregated, (pairs // len(user_ids), pairs % len(user_ids))), shape=(len(item_ids), len(user_ids))
+    )
+    # aggregated zeros are missing values in pivot table filled with zeros
+    matrix.eliminate_zeros()
+
+    return matrix, item_ids
@@ -0,0 +1,53 @@
+# External libraries
+import threading
+
+from loguru import logger
+
+
+class ModelLoader:
+    """
+    Prepare model in background thread, so application can start serving (e.g. readiness checks) immediately.
+    """
+    def __init__(self, create_model):
+        """
+        :param (callable) create_model: function without arguments returning ready model.
+        """
+        self.create_model = create_model
+        self.model = None
+        self.error = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set() and self.model is not None
+
+    def start(self) -> None:
+        """
+        Start preparing model in background thread, if it was not started yet.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name="model-loader", daemon=True)
+                self._thread.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait until model is prepared (or preparing failed).
+
+        :param (float) timeout: maximal time of waiting in seconds (wait without limit if None).
+
+        :return bool: True if model is ready.
+        """
+        self._ready.wait(timeout)
+        return self.ready
+
+    def _load(self) -> None:
+        try:
+            self.model = self.create_model()
+        except Exception as error:
+            logger.exception(f"Preparing the model failed: {error}")
+            self.error = error
+        finally:
+            self._ready.set()
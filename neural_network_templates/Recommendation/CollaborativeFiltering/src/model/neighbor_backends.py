@@ -0,0 +1,148 @@
+# External libraries
+import abc
+
+import numpy
+
+from scipy.sparse import csr_matrix, diags
+from sklearn.neighbors import NearestNeighbors
+
+
+def normalize_rows(data: csr_matrix) -> csr_matrix:
+    """
+    Scale rows of matrix to unit L2 norm, so dot product of rows is their cosine similarity.
+
+    :param (csr_matrix) data: item-user matrix.
+
+    :return csr_matrix: matrix with normalized rows (rows of zeros stay zeros).
+    """
+    norms = numpy.sqrt(numpy.asarray(data.multiply(data).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+
+    return csr_matrix(diags(1.0 / norms) @ data)
+
+
+class NeighborBackendInterface(abc.ABC):
+    """
+    Interface of nearest neighbors search used by the recommender.
+    """
+    @abc.abstractmethod
+    def fit(self, data: csr_matrix) -> "NeighborBackendInterface":
+        """
+        Build search structure over items.
+
+        :param (csr_matrix) data: item-user matrix.
+
+        :return NeighborBackendInterface: fitted backend.
+        """
+
+    @abc.abstractmethod
+    def kneighbors(self, rows: csr_matrix, n_neighbors: int) -> (numpy.ndarray, numpy.ndarray):
+        """
+        Find nearest items of passed rows, with the same result layout as NearestNeighbors.kneighbors.
+
+        :param (csr_matrix) rows: rows of item-user matrix we search neighbors for.
+        :param (int) n_neighbors: number of neighbors.
+
+        :return (numpy.ndarray, numpy.ndarray): distances and indices of neighbors sorted from the nearest.
+        """
+
+
+class BruteForceBackend(NeighborBackendInterface):
+    """
+    Exact search of nearest neighbors with scikit-learn NearestNeighbors.
+    """
+    def __init__(self, metric: str = 'cosine', algorithm: str = 'brute', k: int = 20):
+        self.model = NearestNeighbors(metric=metric, algorithm=algorithm, n_neighbors=k, n_jobs=-1)
+
+    def fit(self, data: csr_matrix) -> "BruteForceBackend":
+        self.model.fit(data)
+        return self
+
+    def kneighbors(self, rows: csr_matrix, n_neighbors: int) -> (numpy.ndarray, numpy.ndarray):
+        return self.model.kneighbors(rows, n_neighbors=n_neighbors)
+
+
+class LSHBackend(NeighborBackendInterface):
+    """
+    Approximate cosine search with random-projection locality sensitive hashing over L2-normalized items.
+
+    Every table hashes item to bucket by signs of n_bits random projections. Candidates are items sharing bucket
+    with query in any table (and in n_probes buckets differing in the least certain bits), only candidates are
+    ranked with exact cosine distance. More tables and probes increase recall, more bits decrease latency.
+    """
+    def __init__(self, n_tables: int = 8, n_bits: int = 12, n_probes: int = 0, seed: int = 0):
+        """
+        Set parameters of the index.
+
+        :param (int) n_tables: number of hash tables.
+        :param (int) n_bits: number of random projections (bits of hash) in every table.
+        :param (int) n_probes: number of additional buckets probed in every table.
+        :param (int) seed: seed of random projections.
+        """
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.n_probes = n_probes
+        self.seed = seed
+        self.data = None
+        self.projections = None
+        self.tables = None
+
+    def fit(self, data: csr_matrix) -> "LSHBackend":
+        self.data = normalize_rows(data)
+        rng = numpy.random.default_rng(self.seed)
+        # projections of all tables in one matrix, so every item is projected with single multiplication
+        self.projections = rng.standard_normal((data.shape[1], self.n_tables * self.n_bits))
+        projected = numpy.asarray(self.data @ self.projections)
+        self.tables = []
+        for table in range(self.n_tables):
+            codes = self._codes(projected[:, table * self.n_bits:(table + 1) * self.n_bits])
+            order = numpy.argsort(codes, kind='stable')
+            bucket_codes, starts = numpy.unique(codes[order], return_index=True)
+            self.tables.append(dict(zip(bucket_codes.tolist(), numpy.split(order, starts[1:]))))
+        return self
+
+    def _codes(self, projected: numpy.ndarray) -> numpy.ndarray:
+        """
+        Get hash codes of projected items.
+
+        :param (numpy.ndarray) projected: items projected on random vectors of one table.
+
+        :return numpy.ndarray: hash code of every item.
+        """
+        return (projected > 0) @ (1 << numpy.arange(self.n_bits, dtype=numpy.int64))
+
+    def _candidates(self, row: csr_matrix) -> numpy.ndarray:
+        """
+        Get items sharing probed buckets with the row in any table.
+
+        :param (csr_matrix) row: normalized row of item-user matrix.
+
+        :return numpy.ndarray: indices of candidate items.
+        """
+        candidates = []
+        projected_row = numpy.asarray(row @ self.projections).ravel()
+        for table_number, table in enumerate(self.tables):
+            projected = projected_row[table_number * self.n_bits:(table_number + 1) * self.n_bits]
+            code = int(self._codes(projected))
+            # bits with projection closest to zero are the most likely to differ for near items
+            flipped_bits = numpy.argsort(numpy.abs(projected))[:self.n_probes]
+            for probe in [code] + [code ^ (1 << int(bit)) for bit in flipped_bits]:
+                if probe in table:
+                    candidates.append(table[probe])
+
+        return numpy.unique(numpy.concatenate(candidates)) if candidates else numpy.empty(0, dtype=numpy.int64)
+
+    def kneighbors(self, rows: csr_matrix, n_neighbors: int) -> (numpy.ndarray, numpy.ndarray):
+        rows = normalize_rows(csr_matrix(rows))
+        distances = numpy.empty((rows.shape[0], n_neighbors))
+        indices = numpy.empty((rows.shape[0], n_neighbors), dtype=numpy.int64)
+        for i in range(rows.shape[0]):
+            candidates = self._candidates(rows[i])
+            if len(candidates) < n_neighbors:
+                # too few candidates, rank all items
+                candidates = numpy.arange(self.data.shape[0])
+            candidate_distances = numpy.clip(1.0 - (self.data[candidates] @ rows[i].T).toarray().ravel(), 0, 2)
+            nearest = numpy.argsort(candidate_distances, kind='stable')[:n_neighbors]
+            distances[i], indices[i] = candidate_distances[nearest], candidates[nearest]
+
+        return distances, indices
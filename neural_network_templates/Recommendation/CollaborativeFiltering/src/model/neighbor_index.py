@@ -0,0 +1,113 @@
+# External libraries
+import os
+
+import numpy
+
+from loguru import logger
+from scipy.sparse import csr_matrix
+
+# Internal libraries
+from model.neighbor_backends import normalize_rows
+
+INDICES_FILE = "neighbor_indices.npy"
+DISTANCES_FILE = "neighbor_distances.npy"
+
+
+class NeighborIndex:
+    """
+    Precomputed top-K cosine neighbors of every item, so searching neighbors is a lookup in arrays.
+    """
+    def __init__(self, indices: numpy.ndarray, distances: numpy.ndarray):
+        self.indices = indices
+        self.distances = distances
+        self.k = indices.shape[1]
+
+    @classmethod
+    def build(cls, data: csr_matrix, k: int, block_size: int = 1024) -> "NeighborIndex":
+        """
+        Build index of top-K cosine neighbors of every item with blocked sparse matrix multiplication.
+
+        :param (csr_matrix) data: item-user matrix.
+        :param (int) k: number of neighbors stored for every item (the item itself included).
+        :param (int) block_size: number of items whose distances are in memory at once.
+
+        :return NeighborIndex: index of neighbors.
+        """
+        n_items = data.shape[0]
+        k = min(k, n_items)
+        normalized = normalize_rows(data)
+        normalized_transposed = normalized.T.tocsc()
+
+        indices = numpy.empty((n_items, k), dtype=numpy.int32)
+        distances = numpy.empty((n_items, k), dtype=numpy.float32)
+        logger.debug(f"Building index of {k} neighbors for {n_items} items...")
+        for start in range(0, n_items, block_size):
+            stop = min(start + block_size, n_items)
+            block_distances = 1.0 - (normalized[start:stop] @ normalized_transposed).toarray()
+            numpy.clip(block_distances, 0, 2, out=block_distances)
+            indices[start:stop], distances[start:stop] = cls._top_k(block_distances, k)
+
+        return cls(indices, distances)
+
+    @staticmethod
+    def _top_k(block_distances: numpy.ndarray, k: int) -> (numpy.ndarray, numpy.ndarray):
+        """
+        Get k nearest columns of every row of distance matrix, sorted from the nearest.
+
+        :param (numpy.ndarray) block_distances: distances of block of items from all items.
+        :param (int) k: number of neighbors.
+
+        :return (numpy.ndarray, numpy.ndarray): indices and distances of neighbors.
+        """
+        rows = numpy.arange(block_distances.shape[0])[:, None]
+        if k < block_distances.shape[1]:
+            candidates = numpy.argpartition(block_distances, k - 1, axis=1)[:, :k]
+        else:
+            candidates = numpy.argsort(block_distances, axis=1)
+        candidates = candidates[rows, numpy.argsort(block_distances[rows, candidates], axis=1)]
+
+        return candidates, block_distances[rows, candidates]
+
+    def kneighbors(self, item_ids, n_neighbors: int) -> (numpy.ndarray, numpy.ndarray):
+        """
+        Get nearest neighbors of items, with the same result layout as NearestNeighbors.kneighbors.
+
+        :param item_ids: ID or array of IDs of the items.
+        :param (int) n_neighbors: number of neighbors, from 1 to k of the index.
+
+        :return (numpy.ndarray, numpy.ndarray): distances and indices of neighbors, one row per item.
+        """
+        if n_neighbors < 1:
+            raise ValueError(f"Number of neighbors must be positive, {n_neighbors} requested.")
+        if n_neighbors > self.k:
+            raise ValueError(f"Index contains only {self.k} neighbors, {n_neighbors} requested.")
+        rows = numpy.atleast_1d(item_ids)
+
+        return self.distances[rows, :n_neighbors], self.indices[rows, :n_neighbors]
+
+    def save(self, path: str) -> None:
+        """
+        Save index as NumPy arrays in directory.
+
+        :param (str) path: path to the directory.
+        """
+        os.makedirs(path, exist_ok=True)
+        numpy.save(os.path.join(path, INDICES_FILE), self.indices)
+        numpy.save(os.path.join(path, DISTANCES_FILE), self.distances)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> "NeighborIndex":
+        """
+        Load index saved with save.
+
+        :param (str) path: path to the directory.
+        :param (bool) mmap: memory-map arrays instead of reading them to memory.
+
+        :return NeighborIndex: index of neighbors.
+        """
+        mmap_mode = "r" if mmap else None
+
+        return cls(
+            numpy.load(os.path.join(path, INDICES_FILE), mmap_mode=mmap_mode),
+            numpy.load(os.path.join(path, DISTANCES_FILE), mmap_mode=mmap_mode)
+        )
@@ -0,0 +1,99 @@
+# External libraries
+import argparse
+import time
+
+import numpy
+
+from loguru import logger
+from scipy.sparse import csr_matrix
+
+# Internal libraries
+from model.neighbor_backends import BruteForceBackend, LSHBackend, NeighborBackendInterface
+
+
+def _search(backend: NeighborBackendInterface, data: csr_matrix, queries: numpy.ndarray, k: int) -> (list, list):
+    """
+    Search k neighbors of every query item, one query at a time like in the recommendation endpoint.
+
+    :param (NeighborBackendInterface) backend: fitted nearest neighbors backend.
+    :param (csr_matrix) data: item-user matrix.
+    :param (numpy.ndarray) queries: IDs of query items.
+    :param (int) k: number of neighbors (the query item itself excluded).
+
+    :return (list, list): set of neighbors and latency in seconds of every query.
+    """
+    neighbors, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        _, indices = backend.kneighbors(data[query], n_neighbors=k + 1)
+        latencies.append(time.perf_counter() - start)
+        neighbors.append(set(indices.ravel().tolist()) - {int(query)})
+
+    return neighbors, latencies
+
+
+def recall_at_k(backend: NeighborBackendInterface, reference: NeighborBackendInterface, data: csr_matrix, k: int,
+                n_queries: int = None, seed: int = 0) -> dict:
+    """
+    Compare neighbors found by backend with neighbors found by exact reference backend.
+
+    :param (NeighborBackendInterface) backend: fitted backend we evaluate.
+    :param (NeighborBackendInterface) reference: fitted exact backend.
+    :param (csr_matrix) data: item-user matrix.
+    :param (int) k: number of neighbors.
+    :param (int) n_queries: number of randomly chosen query items (all items if None).
+    :param (int) seed: seed of choosing query items.
+
+    :return dict: mean recall@k and latency percentiles of both backends in milliseconds.
+    """
+    queries = numpy.arange(data.shape[0])
+    if n_queries is not None and n_queries < len(queries):
+        queries = numpy.random.default_rng(seed).choice(queries, n_queries, replace=False)
+
+    found, latencies = _search(backend, data, queries, k)
+    exact, reference_latencies = _search(reference, data, queries, k)
+    recalls = [len(approximate & expected) / len(expected) for approximate, expected in zip(found, exact) if expected]
+
+    return {
+        "recall": float(numpy.mean(recalls)),
+        "p50_ms": float(numpy.percentile(latencies, 50) * 1000),
+        "p99_ms": float(numpy.percentile(latencies, 99) * 1000),
+        "reference_p50_ms": float(numpy.percentile(reference_latencies, 50) * 1000),
+        "reference_p99_ms": float(numpy.percentile(reference_latencies, 99) * 1000),
+    }
+
+
+def get_input_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recall@K and latency of LSH backend against brute force search.")
+    parser.add_argument('--k', type=int, default=5, help='Number of neighbors.')
+    parser.add_argument('--tables', type=int, nargs='+', default=[4, 8, 16], help='Numbers of hash tables.')
+    parser.add_argument('--bits', type=int, nargs='+', default=[4, 8], help='Numbers of bits of hash.')
+    parser.add_argument('--probes', type=int, nargs='+', default=[0, 2], help='Numbers of additional probes.')
+    parser.add_argument('--queries', type=int, default=None, help='Number of query songs (default: all songs).')
+    return parser.parse_args()
+
+
+def main() -> None:
+    # Internal libraries
+    from data import load_data
+    from model.recommender import prepare_model
+
+    in_arg = get_input_args()
+    logger.remove()
+    rating, songs = load_data.run("data", "Data_InCarMusic.xlsx")
+    data = prepare_model(rating, songs, build_index=False).data
+    reference = BruteForceBackend().fit(data)
+
+    for n_tables in in_arg.tables:
+        for n_bits in in_arg.bits:
+            for n_probes in in_arg.probes:
+                backend = LSHBackend(n_tables=n_tables, n_bits=n_bits, n_probes=n_probes).fit(data)
+                result = recall_at_k(backend, reference, data, in_arg.k, in_arg.queries)
+                print(f"tables={n_tables:<3} bits={n_bits:<3} probes={n_probes:<3} "
+                      f"recall@{in_arg.k}={result['recall']:.3f} "
+                      f"p50={result['p50_ms']:.2f}ms p99={result['p99_ms']:.2f}ms "
+                      f"(brute force p50={result['reference_p50_ms']:.2f}ms p99={result['reference_p99_ms']:.2f}ms)")
+
+
+if __name__ == "__main__":
+    main()
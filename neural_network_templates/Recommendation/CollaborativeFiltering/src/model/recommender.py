@@ -1,25 +1,50 @@
 # External libraries
-import pandas
+import numpy
 
-from fuzzywuzzy import fuzz
 from loguru import logger
 from pandas.core.frame import DataFrame
-from scipy.sparse import csr_matrix
-from sklearn.neighbors import NearestNeighbors
+
+# Internal libraries
+from model.item_user_matrix import build_item_user_matrix
+from model.neighbor_backends import BruteForceBackend, NeighborBackendInterface
+from model.neighbor_index import NeighborIndex
+from model.result_cache import ResultCache
+from model.title_matcher import TitleMatcher
 
 
 class Recommender:
     """
     Object for collaborative recommender that use knn algorithm.
     """
-    def __init__(self, metric, algorithm, k, data, decode_id_song):
+    def __init__(self, metric, algorithm, k, data, decode_id_song, neighbor_index=None, cache_size=1024,
+                 cache_ttl=None, backend=None):
         self.metric = metric
         self.algorithm = algorithm
         self.k = k
         self.data = data
         self.decode_id_song = decode_id_song
         self.data = data
-        self.model = self._recommender().fit(data)
+        self.model = (backend or self._recommender()).fit(data)
+        self.neighbor_index = neighbor_index
+        self.title_matcher = TitleMatcher(decode_id_song)
+        self.song_titles = self._map_indeces_to_song_title()
+        self.result_cache = ResultCache(max_size=cache_size, ttl=cache_ttl)
+
+    def build_neighbor_index(self, block_size: int = 1024) -> NeighborIndex:
+        """
+        Precompute k nearest neighbors of every song, so recommendations are looked up instead of searched.
+
+        :param (int) block_size: number of songs whose distances are in memory at once.
+
+        :return NeighborIndex: index of neighbors used by the recommender.
+        """
+        if self.metric != 'cosine':
+            raise ValueError(f"Neighbor index supports only cosine metric, not {self.metric}.")
+        # the nearest neighbor of the song is the song itself
+        self.neighbor_index = NeighborIndex.build(self.data, k=self.k + 1, block_size=block_size)
+        self.result_cache.clear()
+
+        return self.neighbor_index
 
     def make_recommendation(self, new_song: str, n_recommendations: int) -> list:
         """
@@ -35,13 +60,42 @@ class Recommender:
 
         return recommended
 
-    def _recommender(self) -> NearestNeighbors:
+    def make_recommendations_batch(self, song_titles: list, n_recommendations: int) -> list:
         """
-        Get recommender model based on nearest neighbors architecture.
+        Make lists of recommended songs for many song titles with single search of nearest neighbors.
+
+        :param (list) song_titles: names of the songs on which we base recommendations.
+        :param (int) n_recommendations: number of recommendations we want to have for every song.
 
-        :return sklearn.neighbors._unsupervised.NearestNeighbors: nearest neighbors model.
+        :return list: list of recommendations for every passed song (empty list if song was not matched).
         """
-        return NearestNeighbors(metric=self.metric, algorithm=self.algorithm, n_neighbors=self.k, n_jobs=-1)
+        logger.debug(f"Getting the IDs of {len(song_titles)} songs according to the passed strings...")
+        song_ids = [self._fuzzy_matching(song=song_title) for song_title in song_titles]
+
+        recommendations = {}
+        for song_id in set(song_ids) - {None}:
+            found, recommended = self.result_cache.get((song_id, n_recommendations))
+            if found:
+                recommendations[song_id] = recommended
+        not_cached_ids = [song_id for song_id in set(song_ids) - {None} if song_id not in recommendations]
+        if not_cached_ids:
+            logger.debug(f"Starting the recommendation process for {len(not_cached_ids)} songs...")
+            distances, indices = self._kneighbors(numpy.array(not_cached_ids), n_neighbors=n_recommendations + 1)
+            for song_id, song_indices, song_distances in zip(not_cached_ids, indices, distances):
+                recommended = self._translate(self._rank_neighbours(song_indices, song_distances))
+                self.result_cache.put((song_id, n_recommendations), recommended)
+                recommendations[song_id] = recommended
+        logger.debug("Batch recommendation process status: DONE")
+
+        return [list(recommendations.get(song_id, [])) for song_id in song_ids]
+
+    def _recommender(self) -> NeighborBackendInterface:
+        """
+        Get default recommender model based on exact nearest neighbors search.
+
+        :return NeighborBackendInterface: nearest neighbors backend.
+        """
+        return BruteForceBackend(metric=self.metric, algorithm=self.algorithm, k=self.k)
 
     def _recommend(self, new_song: str, n_recommendations: int) -> list:
         """
@@ -52,44 +106,86 @@ class Recommender:
 
         :return list: list of recommendations based on passed song.
         """
-        logger.debug("Getting the ID of the recommended songs...")
-        recommendations = []
-        recommendation_ids = self._get_recommendations(new_song=new_song, n_recommendations=n_recommendations)
+        logger.debug("Getting the ID of the song according to the passed string...")
+        song_id = self._fuzzy_matching(song=new_song)
+        if song_id is None:
+            return []
 
-        logger.debug("Getting the name of the song using a mapping dictionary...")
-        recommendations_map = self._map_indeces_to_song_title()
+        found, recommendations = self.result_cache.get((song_id, n_recommendations))
+        if found:
+            logger.debug(f"Recommendations for {new_song} found in cache")
+            return list(recommendations)
+
+        logger.debug("Getting the ID of the recommended songs...")
+        recommendation_ids = self._get_recommendations(song_id=song_id, n_recommendations=n_recommendations)
 
         logger.debug("Translating this recommendations into the ranking of song titles recommended...")
-        for i, (idx, dist) in enumerate(recommendation_ids):
-            recommendations.append(recommendations_map[idx])
+        recommendations = self._translate(recommendation_ids)
+        self.result_cache.put((song_id, n_recommendations), recommendations)
 
-        return recommendations
+        return list(recommendations)
 
-    def _get_recommendations(self, new_song: str, n_recommendations: int) -> list:
+    def _get_recommendations(self, song_id: int, n_recommendations: int) -> list:
         """
-        Get the list of recommended songs based on passed song title.
+        Get the list of recommended songs based on ID of the song.
 
-        :param (str) new_song: name of the song on which we base recommendations.
+        :param (int) song_id: ID of the song on which we base recommendations.
         :param (int) n_recommendations: number of recommendations we want to have.
 
         :return list: list of recommendations based on passed song.
         """
-        logger.debug("Getting the ID of the song according to the passed string...")
-        recommendation_song_id = self._fuzzy_matching(song=new_song)
+        logger.debug(f"Starting the recommendation process for song {song_id} ...")
+        distances, indices = self._kneighbors(song_id, n_neighbors=n_recommendations + 1)
+
+        return self._rank_neighbours(indices.squeeze(), distances.squeeze())
+
+    def _translate(self, recommendation_ids: list) -> list:
+        """
+        Translate ranking of song IDs into ranking of song titles.
+
+        :param (list) recommendation_ids: list of pairs of song ID and distance.
+
+        :return list: list of song titles.
+        """
+        return [self.song_titles[idx] for idx, _ in recommendation_ids]
+
+    def _kneighbors(self, song_ids, n_neighbors: int) -> (numpy.ndarray, numpy.ndarray):
+        """
+        Get nearest neighbors of songs from neighbor index, or search them with model if index is too small.
+
+        :param song_ids: ID or array of IDs of the songs.
+        :param (int) n_neighbors: number of neighbors (the song itself included).
 
-        logger.debug(f"Starting the recommendation process for {new_song} ...")
-        distances, indices = self.model.kneighbors(self.data[recommendation_song_id], n_neighbors=n_recommendations + 1)
+        :return (numpy.ndarray, numpy.ndarray): distances and indices of neighbors, one row per song.
+        """
+        if self.neighbor_index is not None and n_neighbors <= self.neighbor_index.k:
+            return self.neighbor_index.kneighbors(song_ids, n_neighbors=n_neighbors)
 
-        return sorted(list(zip(indices.squeeze().tolist(), distances.squeeze().tolist())), key=lambda x: x[1])[:0:-1]
+        return self.model.kneighbors(self.data[song_ids], n_neighbors=n_neighbors)
 
-    def _map_indeces_to_song_title(self) -> dict:
+    @staticmethod
+    def _rank_neighbours(indices, distances) -> list:
+        """
+        Rank neighbours of one song, the nearest neighbour (the song itself) is skipped.
+
+        :param (numpy.ndarray) indices: IDs of the neighbours of the song.
+        :param (numpy.ndarray) distances: distances of the neighbours from the song.
+
+        :return list: list of pairs of neighbour ID and distance.
+        """
+        return sorted(list(zip(indices.tolist(), distances.tolist())), key=lambda x: x[1])[:0:-1]
+
+    def _map_indeces_to_song_title(self) -> numpy.ndarray:
         """
         Map songs IDs to songs titles.
 
-        :return dict: map of the song IDs to songs titles.
+        :return numpy.ndarray: array of songs titles indexed by song ID (None for IDs without title).
         """
         logger.debug("Getting reverse mapper...")
-        return {song_id: song_title for song_title, song_id in self.decode_id_song.items()}
+        song_titles = numpy.full(self.data.shape[0], None, dtype=object)
+        song_titles[list(self.decode_id_song.values())] = list(self.decode_id_song)
+
+        return song_titles
 
     def _fuzzy_matching(self, song: str) -> int:
         """
@@ -99,47 +195,43 @@ class Recommender:
 
         :return int: id of the matched song.
         """
-        match_tuple = []
-
         logger.debug("Getting match...")
-        for title, idx in self.decode_id_song.items():
-            match_tuple.append((title, idx, ratio))
+        return self.title_matcher.match(song)
 
-        logger.debug("Sorting results...")
-        match_tuple = sorted(match_tuple, key=lambda x: x[2])[::-1]
-        if not match_tuple:
-            logger.warning(f"The recommendation system could not find a match for {song}")
-            return
 
-        return match_tuple[0][1]
-
-
-def prepare_model(rating, songs) -> Recommender:
+def prepare_model(rating, songs, backend=None, build_index=True) -> Recommender:
     """
     Prepare recommendation model ready to create recommendation based on song name.
 
-    :param (DataFrame) rating: data with user id, song id and rating of songs made by users.
+    :param (DataFrame) rating: data with user id, song id and rating of songs made by users
+                               (or iterable of chunks of the data).
     :param (DataFrame) songs: data of the songs.
+    :param (NeighborBackendInterface) backend: nearest neighbors search (default: exact brute force search).
+    :param (bool) build_index: precompute exact neighbors of all songs (searching with backend only when more
+                               recommendations are requested than index contains).
 
     :return Recommender:
     """
-    logger.debug("Converting the dataframe into a pivot table...")
-    songs_features = pandas.pivot_table(rating, index='ItemID', columns='UserID', values='Rating').fillna(0)
-
-    logger.debug("Obtaining a sparse matrix...")
-    songs_features_matrix = csr_matrix(songs_features.values)
+    logger.debug("Obtaining a sparse matrix of mean ratings of songs by users...")
+    songs_features_matrix, song_ids = build_item_user_matrix(rating, item_column='ItemID', user_column='UserID',
+                                                             value_column='Rating', aggregation='mean')
 
     logger.debug("Creating the model...")
     decode_id_song = {
         song: i for i, song in
-        enumerate(list(songs.set_index('id').loc[songs_features.index].title))
+        enumerate(list(songs.set_index('id').loc[song_ids].title))
     }
     model = Recommender(
         metric='cosine',
         algorithm='brute',
         k=20,
         data=songs_features_matrix,
-        decode_id_song=decode_id_song
+        decode_id_song=decode_id_song,
+        backend=backend
     )
 
+    if build_index:
+        logger.debug("Precomputing neighbors of the songs...")
+        model.build_neighbor_index()
+
     return model
@@ -0,0 +1,79 @@
+# External libraries
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of recommendation results with optional time to live of entries.
+    """
+    def __init__(self, max_size: int = 1024, ttl: float = None):
+        """
+        Create empty cache.
+
+        :param (int) max_size: maximal number of cached results, the least recently used result is evicted first.
+        :param (float) ttl: number of seconds after which cached result expires (never expires if None).
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # endpoints run in thread pool, so cache is shared by threads
+        self._lock = threading.Lock()
+
+    def get(self, key) -> (bool, object):
+        """
+        Get cached result.
+
+        :param key: hashable key of the result.
+
+        :return (bool, object): flag if result was found and the result (None if not found).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value) -> None:
+        """
+        Cache result.
+
+        :param key: hashable key of the result.
+        :param value: the result.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all cached results, e.g. after model was rebuilt.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Get statistics of the cache.
+
+        :return dict: number of hits, misses, hit rate and size of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+        }
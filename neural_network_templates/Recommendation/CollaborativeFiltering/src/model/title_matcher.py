@@ -0,0 +1,99 @@
+# External libraries
+import re
+from collections import defaultdict
+
+import numpy
+
+from fuzzywuzzy import fuzz
+from loguru import logger
+
+NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalize song title, so titles differing only in case, punctuation or spacing are equal.
+
+    :param (str) title: song title.
+
+    :return str: normalized song title.
+    """
+    return NON_ALPHANUMERIC.sub(" ", title.casefold()).strip()
+
+
+class TitleMatcher:
+    """
+    Match passed song title with ID of the song in database.
+
+    Exact match of normalized title is looked up in dictionary. Otherwise titles sharing the most character n-grams
+    with passed title are shortlisted with inverted index and only shortlisted titles are scored with fuzzy ratio.
+    N-grams common to more than max_frequency of titles (e.g. "the") are skipped while shortlisting, so cost of
+    the match does not grow with the size of the catalog.
+    """
+    def __init__(self, decode_id_song: dict, n: int = 3, shortlist_size: int = 50, max_frequency: float = 0.05):
+        """
+        Build indexes of the song titles.
+
+        :param (dict) decode_id_song: map of the song titles to songs IDs.
+        :param (int) n: length of character n-grams.
+        :param (int) shortlist_size: number of titles scored with fuzzy ratio.
+        :param (float) max_frequency: maximal part of titles containing n-gram used for shortlisting.
+        """
+        self.n = n
+        self.shortlist_size = shortlist_size
+        # small catalogs keep all n-grams
+        self.max_postings = max(shortlist_size, int(max_frequency * len(decode_id_song)))
+        self.titles = list(decode_id_song)
+        self.song_ids = numpy.array(list(decode_id_song.values()))
+        self.exact = {}
+        postings = defaultdict(list)
+        for position, title in enumerate(self.titles):
+            normalized = normalize_title(title)
+            # titles without letters and digits (e.g. "???") are matched only with n-grams
+            if normalized:
+                self.exact.setdefault(normalized, self.song_ids[position])
+            for ngram in self._ngrams(title):
+                postings[ngram].append(position)
+        self.postings = {ngram: numpy.array(positions, dtype=numpy.int32) for ngram, positions in postings.items()}
+
+    def _ngrams(self, title: str) -> set:
+        """
+        Get character n-grams of normalized title padded with spaces, so short titles have n-grams too.
+
+        :param (str) title: song title.
+
+        :return set: n-grams of title.
+        """
+        padded = f" {normalize_title(title)} "
+        return {padded[i:i + self.n] for i in range(max(len(padded) - self.n + 1, 1))}
+
+    def match(self, song: str):
+        """
+        Match passed song with ID in database.
+
+        :param (str) song: name of the song we want to match.
+
+        :return int: id of the matched song (None if no title shares any n-gram with passed song).
+        """
+        normalized = normalize_title(song)
+        song_id = self.exact.get(normalized) if normalized else None
+        if song_id is not None:
+            return int(song_id)
+
+        logger.debug("Getting candidates...")
+        postings = sorted((self.postings[ngram] for ngram in self._ngrams(song) if ngram in self.postings), key=len)
+        if not postings:
+            logger.warning(f"The recommendation system could not find a match for {song}")
+            return None
+        # skip common n-grams, but keep the rarest one if all n-grams of the song are common
+        postings = [positions for positions in postings if len(positions) <= self.max_postings] or postings[:1]
+        candidates, shared_ngrams = numpy.unique(numpy.concatenate(postings), return_counts=True)
+        if len(candidates) > self.shortlist_size:
+            shortlist = numpy.argpartition(shared_ngrams, -self.shortlist_size)[-self.shortlist_size:]
+            candidates = candidates[shortlist]
+
+        logger.debug("Scoring candidates...")
+        song = song.casefold()
+        best = max(candidates, key=lambda position: fuzz.ratio(self.titles[position].casefold(), song))
+
+        return int(self.song_ids[best])
@@ -18,3 +18,16 @@ def pytest_addoption(parser):
         default=False,
         help="validate output resource via live validation service (http)"
     )
+
+
+@pytest.fixture
+def ready_model():
+    """
+    Start preparing recommendation model (ASGI test client does not run application lifespan) and wait for it.
+    """
+    from main import model_loader
+
+    model_loader.start()
+    assert model_loader.wait(timeout=120), f"Model is not ready: {model_loader.error}"
+
+    return model_loader.model
@@ -0,0 +1,34 @@
+# External libraries
+import numpy
+
+# Internal libraries
+from model import artifact
+
+
+def test_save_and_load_recommender(ready_model, tmp_path):
+    path = str(tmp_path / "recommender")
+    artifact.save_recommender(ready_model, path, metadata={"data_hash": "abc"})
+    artifact.save_recommender(ready_model, path, metadata={"data_hash": "def"})
+
+    loaded = artifact.load_recommender(path, mmap=True)
+
+    assert artifact.read_meta(path)["metadata"] == {"data_hash": "def"}
+    assert isinstance(loaded.neighbor_index.indices, numpy.memmap)
+    assert (loaded.data != ready_model.data).nnz == 0
+    assert loaded.make_recommendation("The Thrill is Gone", 5) == ready_model.make_recommendation("The Thrill is Gone", 5)
+    assert loaded.make_recommendation("Purple Haze", 30) == ready_model.make_recommendation("Purple Haze", 30)
+
+
+def test_load_or_create_model_reuses_artifact(ready_model, tmp_path, monkeypatch):
+    import main
+
+    created = []
+    monkeypatch.setattr(main, "ARTIFACT_PATH", str(tmp_path / "recommender"))
+    monkeypatch.setattr(main, "create_model", lambda: created.append(True) or ready_model)
+
+    first = main.load_or_create_model()
+    second = main.load_or_create_model()
+
+    assert len(created) == 1
+    assert first is ready_model
+    assert (second.data != ready_model.data).nnz == 0
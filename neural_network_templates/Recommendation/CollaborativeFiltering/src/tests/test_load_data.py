@@ -0,0 +1,68 @@
+# External libraries
+import os
+
+import pandas
+import pytest
+
+# Internal libraries
+from data import load_data
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("source file should not be read")
+
+
+def test_load_table_uses_cache_until_source_changes(tmp_path, monkeypatch):
+    source = tmp_path / "rating.csv"
+    source.write_text("UserID,ItemID, Rating,mood\n1,10,4,happy\n2,10,3,\n")
+
+    table = load_data.load_table(str(source))
+    assert table["UserID"].tolist() == [1, 2]
+    assert table["mood"].isna().tolist() == [False, True]
+
+    with monkeypatch.context() as patch:
+        patch.setattr(load_data, "read_source", _fail)
+        os.utime(source, ns=(0, 0))
+        cached = load_data.load_table(str(source))
+    assert cached[" Rating"].tolist() == [4, 3]
+
+    with monkeypatch.context() as patch:
+        patch.setattr(load_data, "read_source", _fail)
+        patch.setattr(load_data, "file_hash", _fail)
+        # mtime of touched source was stored in the cache, so source is not hashed again
+        assert load_data.load_table(str(source))[" Rating"].tolist() == [4, 3]
+
+    source.write_text("UserID,ItemID, Rating,mood\n1,10,5,sad\n")
+    assert load_data.load_table(str(source))[" Rating"].tolist() == [5]
+
+
+def test_read_source_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        load_data.read_source("rating.json")
+
+
+def test_warm_cache_equals_cold_read(tmp_path, monkeypatch):
+    source = tmp_path / "rating.xlsx"
+    pandas.DataFrame({
+        "UserID": [1, 2, 3],
+        " Rating": [4.5, None, 3.0],
+        "liked": [True, False, True],
+        "time": pandas.to_datetime(["2020-01-01", "2021-06-30", None]),
+        "mood": ["happy", None, "sad"],
+    }).to_excel(source, sheet_name="ContextualRating", index=False)
+
+    cold = load_data.load_table(str(source), "ContextualRating")
+    with monkeypatch.context() as patch:
+        patch.setattr(load_data, "read_source", _fail)
+        warm = load_data.load_table(str(source), "ContextualRating")
+
+    pandas.testing.assert_frame_equal(warm, cold)
+    assert warm["liked"].dtype == bool
+    assert warm["time"].dtype.kind == "M"
+
+
+def test_save_columnar_rejects_mixed_column(tmp_path):
+    table = pandas.DataFrame({"title": pandas.Series([1, "1", "a"], dtype=object)})
+
+    with pytest.raises(ValueError):
+        load_data.save_columnar(table, str(tmp_path / "cache.npz"), {})
@@ -7,6 +7,8 @@ from httpx import AsyncClient
 # Internal libraries
 from main import app
 
+pytestmark = pytest.mark.usefixtures("ready_model")
+
 
 @pytest.mark.asyncio
 async def test_get():
@@ -23,3 +25,55 @@ async def test_get():
                 'The Trooper'
             ],
     }
+
+
+@pytest.mark.asyncio
+async def test_post_batch():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post(
+            "/recommend/batch",
+            json={"song_names": ["The Thrill is Gone", "Purple Haze"], "number_of_recommendations": 5}
+        )
+        single_response = await ac.get("/recommend/Purple Haze")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["Recommendations"] == [
+        [
+            'Halte durch',
+            'Dont Tell Me That Its Over',
+            'Purple Haze',
+            'Stormy Monday',
+            'The Trooper'
+        ],
+        single_response.json()["Recommendations"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_misspelled_title():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        exact_response = await ac.get("/recommend/The Thrill is Gone")
+        response = await ac.get("/recommend/the thril is gone!")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == exact_response.json()
+
+
+@pytest.mark.asyncio
+async def test_get_rejects_non_positive_number_of_recommendations():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/recommend/The Thrill is Gone", params={"number_of_recommendations": -3})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_neighbor_index_rejects_non_positive_number_of_neighbors(ready_model):
+    with pytest.raises(ValueError):
+        ready_model.neighbor_index.kneighbors(0, n_neighbors=0)
+
+
+@pytest.mark.asyncio
+async def test_post_batch_rejects_non_positive_number_of_recommendations():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post(
+            "/recommend/batch",
+            json={"song_names": ["The Thrill is Gone"], "number_of_recommendations": 0}
+        )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
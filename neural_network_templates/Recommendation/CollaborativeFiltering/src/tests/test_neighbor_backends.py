@@ -0,0 +1,26 @@
+# External libraries
+import scipy.sparse
+
+# Internal libraries
+from model.neighbor_backends import BruteForceBackend, LSHBackend
+from model.recall import recall_at_k
+
+
+def test_lsh_recall():
+    data = scipy.sparse.random(500, 40, density=0.2, format="csr", random_state=0)
+    reference = BruteForceBackend().fit(data)
+    backend = LSHBackend(n_tables=16, n_bits=4, n_probes=2).fit(data)
+
+    result = recall_at_k(backend, reference, data, k=5, n_queries=100)
+
+    assert result["recall"] >= 0.9
+
+
+def test_lsh_returns_requested_number_of_neighbors():
+    data = scipy.sparse.random(50, 10, density=0.3, format="csr", random_state=0)
+    backend = LSHBackend(n_tables=1, n_bits=16).fit(data)
+
+    distances, indices = backend.kneighbors(data[[0, 1]], n_neighbors=6)
+
+    assert indices.shape == distances.shape == (2, 6)
+    assert (distances[:, 1:] >= distances[:, :-1]).all()
@@ -14,3 +14,25 @@ async def test_root():
         response = await ac.get("/")
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {"STATUS": "Klinesso Recommender API"}
+
+
+@pytest.mark.asyncio
+async def test_ready(ready_model):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/ready")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"READY": True}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("ready_model")
+async def test_metrics():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        before = (await ac.get("/metrics")).json()["result_cache"]
+        await ac.get("/recommend/Stormy Monday", params={"number_of_recommendations": 3})
+        await ac.get("/recommend/Stormy Monday", params={"number_of_recommendations": 3})
+        response = await ac.get("/metrics")
+    assert response.status_code == HTTPStatus.OK
+    after = response.json()["result_cache"]
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
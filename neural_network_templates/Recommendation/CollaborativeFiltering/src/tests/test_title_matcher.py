@@ -0,0 +1,25 @@
+# Internal libraries
+from model.title_matcher import TitleMatcher, normalize_title
+
+
+def test_normalize_title_keeps_non_latin_letters():
+    assert normalize_title("  Пісня, моя! ") == "пісня моя"
+    assert normalize_title("夜曲") == "夜曲"
+    assert normalize_title("???") == ""
+
+
+def test_match_non_latin_and_punctuation_only_titles():
+    matcher = TitleMatcher({"Пісня": 1, "夜曲": 2, "Hello": 3})
+
+    assert matcher.match("пісня") == 1
+    assert matcher.match("夜曲") == 2
+    assert matcher.match("hello!") == 3
+    assert matcher.match("???") is None
+
+
+def test_match_skips_common_ngrams():
+    titles = {f"The Song {number}": number for number in range(1000)}
+    titles["The Thrill is Gone"] = 1000
+    matcher = TitleMatcher(titles)
+
+    assert matcher.match("the thril is gone") == 1000